@@ -195,7 +195,7 @@ except:
     WIKI_OK = False
 
 try:
-    from src.script_generator import GroqScriptGenerator
+    from src.script_generator import GroqScriptGenerator, ErrorCode
     SCRIPT_OK = True
 except:
     SCRIPT_OK = False
@@ -206,6 +206,11 @@ try:
 except:
     TTS_OK = False
 
+@st.cache_resource
+def get_wikipedia_handler() -> "WikipediaHandler":
+    """One handler per server process so its search/article caches are shared across reruns"""
+    return WikipediaHandler()
+
 def check_groq_key() -> Optional[str]:
     try:
         return st.secrets.get("GROQ_API_KEY") or os.getenv("GROQ_API_KEY")
@@ -243,42 +248,60 @@ async def generate_audio_segment(text: str, voice: str, audience: str) -> bytes:
         
         # Generate audio with ONLY rate parameter (no pitch)
         communicate = edge_tts.Communicate(clean_text, voice, rate=rate)
-        audio_bytes = b""
+        audio_chunks = []
         
         async for chunk in communicate.stream():
             if chunk["type"] == "audio":
-                audio_bytes += chunk["data"]
+                audio_chunks.append(chunk["data"])
         
-        return audio_bytes
+        return b"".join(audio_chunks)
     
     except Exception as e:
         st.error(f"TTS Error: {str(e)}")
         return b""
 
+TTS_CONCURRENCY = 4
+
+async def generate_all_segments(dialogue: List[Dict], audience: str, on_segment_done) -> List[bytes]:
+    """Generate every dialogue turn concurrently, preserving dialogue order"""
+    voice_male, voice_female = get_indian_voices(audience)
+    semaphore = asyncio.Semaphore(TTS_CONCURRENCY)
+    
+    async def generate_turn(turn: Dict) -> bytes:
+        speaker = turn.get("speaker", "Rajesh")
+        voice = voice_male if speaker == "Rajesh" else voice_female
+        
+        async with semaphore:
+            audio_bytes = await generate_audio_segment(turn.get("text", ""), voice, audience)
+        
+        on_segment_done(speaker)
+        return audio_bytes
+    
+    return await asyncio.gather(*(generate_turn(turn) for turn in dialogue))
+
 def generate_podcast_audio(dialogue: List[Dict], audience: str) -> str:
     """Generate podcast audio with progress tracking"""
     try:
         output_dir = Path("outputs")
         output_dir.mkdir(exist_ok=True)
         
-        voice_male, voice_female = get_indian_voices(audience)
         audio_segments = []
         
         progress_bar = st.progress(0)
         status_text = st.empty()
         
         total_turns = len(dialogue)
+        completed = 0
         
-        for idx, turn in enumerate(dialogue):
-            speaker = turn.get("speaker", "Rajesh")
-            text = turn.get("text", "")
-            voice = voice_male if speaker == "Rajesh" else voice_female
-            
-            status_text.text(f"🎙️ Generating {speaker}'s voice ({idx + 1}/{total_turns})...")
-            progress_bar.progress((idx + 1) / total_turns)
-            
-            audio_bytes = asyncio.run(generate_audio_segment(text, voice, audience))
-            
+        def on_segment_done(speaker: str):
+            nonlocal completed
+            completed += 1
+            status_text.text(f"🎙️ Generated {speaker}'s voice ({completed}/{total_turns})...")
+            progress_bar.progress(completed / total_turns)
+        
+        segment_audio = asyncio.run(generate_all_segments(dialogue, audience, on_segment_done))
+        
+        for idx, audio_bytes in enumerate(segment_audio):
             if audio_bytes:
                 audio_segments.append(audio_bytes)
             else:
@@ -359,8 +382,8 @@ if st.session_state.step == 1:
         else:
             with st.spinner("Searching..."):
                 try:
-                    wiki = WikipediaHandler()
-                    results = wiki.search_topics(search_query, limit=10)
+                    wiki = get_wikipedia_handler()
+                    results = wiki.search_and_prefetch(search_query, limit=10)
                     
                     if results:
                         st.session_state.search_results = results
@@ -385,7 +408,7 @@ elif st.session_state.step == 2:
         if st.button("Select", key=f"s_{idx}", use_container_width=True):
             with st.spinner("Loading content..."):
                 try:
-                    wiki = WikipediaHandler()
+                    wiki = get_wikipedia_handler()
                     content = wiki.get_article_content(result['title'], max_chars=5000)
                     
                     if content:
@@ -463,23 +486,24 @@ elif st.session_state.step == 4:
             with st.spinner(f"Creating {config['audience']}-friendly script... (30-60 seconds)"):
                 try:
                     generator = GroqScriptGenerator(api_key=groq_key)
-                    wiki_text = str(st.session_state.wiki_content)[:3000]
+                    wiki_text = str(st.session_state.wiki_content)
                     
                     result = generator.generate_script(
                         topic=st.session_state.selected_topic,
                         wikipedia_content=wiki_text,
                         duration_minutes=config["duration"],
                         style=config["style"],
-                        audience=config["audience"]
+                        audience=config["audience"],
+                        use_cache=not st.session_state.pop("regenerate", False)
                     )
                     
                     if result.get("success"):
                         st.session_state.script_data = result
                         st.rerun()
                     else:
-                        error_msg = result.get('error', 'Unknown error')
+                        error_msg = result.get('error_message', 'Unknown error')
                         
-                        if "Rate limit" in error_msg:
+                        if result.get("error_code") == ErrorCode.QUOTA_EXCEEDED:
                             st.warning(f"⏳ {error_msg}")
                             st.info("💡 **Tip:** The free tier has limits. Trying again in a moment usually works!")
                         else:
@@ -531,6 +555,7 @@ elif st.session_state.step == 4:
         with col1:
             if st.button("🔄 Regenerate Script"):
                 st.session_state.script_data = None
+                st.session_state.regenerate = True
                 st.session_state.audio_path = None
                 st.rerun()
         with col2:
@@ -14,16 +14,14 @@ class AudioProcessor:
     
     def merge_segments(self, audio_files: List[Path], pause_duration: int = 500):
         """Merge WAV files"""
-        merged = b''
         pause_frames = int((pause_duration / 1000) * self.sample_rate)
         pause = struct.pack('h' * pause_frames, *([0] * pause_frames))
         
-        for i, f in enumerate(audio_files):
+        segments = []
+        for f in audio_files:
             with wave.open(str(f), 'rb') as w:
-                merged += w.readframes(w.getnframes())
-            if i < len(audio_files) - 1:
-                merged += pause
-        return merged
+                segments.append(w.readframes(w.getnframes()))
+        return pause.join(segments)
     
     def normalize_audio(self, audio):
         return audio
@@ -1,6 +1,7 @@
 """
 Speaker persona definitions for different audiences
 """
+import functools
 
 SPEAKER_PERSONAS = {
     "kids": {
@@ -141,6 +142,7 @@ TONE_MODIFIERS = {
     }
 }
 
+@functools.lru_cache(maxsize=32)
 def get_persona(audience: str, gender: str) -> dict:
     """Get speaker persona for given audience and gender"""
     return SPEAKER_PERSONAS.get(audience, {}).get(gender, {})
@@ -3,11 +3,154 @@ Groq-based Script Generator for Hinglish 2-person conversations
 With automatic retry and rate limit handling
 """
 
+import asyncio
+import functools
+import hashlib
 import json
+import logging
+import os
 import re
 import requests
+import threading
 import time
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils import truncate_at_sentence
+
+logger = logging.getLogger(__name__)
+
+_WAIT_TIME_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(ms|s)')
+_PARAGRAPH_BREAK_RE = re.compile(r'\n[ \t]*\n')
+# Longest one-line block treated as a section heading when it has no sentence punctuation
+_MAX_HEADING_CHARS = 80
+
+
+def _is_heading(block: str) -> bool:
+    """Plain-format extracts put each section title in a block of its own, without a full stop"""
+    return '\n' not in block and len(block) <= _MAX_HEADING_CHARS and block[-1] not in '.!?:;,"\')'
+
+
+class ErrorCode(str, Enum):
+    """Machine-readable failure reasons returned by generate_script"""
+    QUOTA_EXCEEDED = "quota_exceeded"
+    MODEL_NOT_FOUND = "model_not_found"
+    API_ERROR = "api_error"
+    INVALID_REQUEST = "invalid_request"
+    TIMEOUT = "timeout"
+    PARSE_ERROR = "parse_error"
+    INVALID_SCRIPT = "invalid_script"
+    UNEXPECTED_ERROR = "unexpected_error"
+    RETRIES_EXHAUSTED = "retries_exhausted"
+
+
+def _error(code: ErrorCode, message: str) -> Dict:
+    return {"success": False, "error_code": code, "error_message": message}
+
+
+_PROMPT_TEMPLATE = """Create a {duration_minutes}-minute Hinglish podcast for {audience}.
+
+Topic: {topic}
+Content: {wikipedia_content}
+
+Style Guide:
+{style_guide}
+- Mix 60% Hindi, 40% English naturally
+- Add fillers: umm, toh, achha, *laughs*
+
+Return JSON only:
+{{
+  "title": "Engaging Hinglish title",
+  "dialogue": [
+    {{"speaker": "Rajesh", "text": "Namaste! Aaj baat karenge..."}},
+    {{"speaker": "Priya", "text": "Haan Rajesh, yeh topic interesting hai..."}}
+  ]
+}}
+
+Create {num_turns}-{max_turns} exchanges. Natural conversation, not Wikipedia reading."""
+
+_BATCH_PROMPT_TEMPLATE = """Create {count} versions of a {duration_minutes}-minute Hinglish podcast, one for each audience below.
+
+Topic: {topic}
+Content: {wikipedia_content}
+
+Audiences:
+{audience_profiles}
+
+Style Guide:
+- Follow each audience's tone and use its words
+- Mix 60% Hindi, 40% English naturally
+- Add fillers: umm, toh, achha, *laughs*
+
+Return JSON only, with one script per audience in the order listed:
+{{
+  "scripts": [
+    {{
+      "audience": "Adults",
+      "title": "Engaging Hinglish title",
+      "dialogue": [
+        {{"speaker": "Rajesh", "text": "Namaste! Aaj baat karenge..."}},
+        {{"speaker": "Priya", "text": "Haan Rajesh, yeh topic interesting hai..."}}
+      ]
+    }}
+  ]
+}}
+
+Create {num_turns}-{max_turns} exchanges per script. Natural conversation, not Wikipedia reading."""
+
+
+class _JsonObjectScanner:
+    """Track brace depth across chunks to find where the first top-level object closes"""
+    
+    def __init__(self):
+        self.start = -1
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.offset = 0
+    
+    def feed(self, chunk: str) -> Optional[int]:
+        """Consume the next chunk; return the end offset once the object is complete"""
+        i = 0
+        if self.start == -1:
+            i = chunk.find("{")
+            if i == -1:
+                self.offset += len(chunk)
+                return None
+            self.start = self.offset + i
+        
+        for i in range(i, len(chunk)):
+            ch = chunk[i]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+            elif ch == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    return self.offset + i + 1
+        
+        self.offset += len(chunk)
+        return None
+
+
+def _find_balanced_json(text: str) -> Optional[str]:
+    """Return the first balanced {...} object in text, scanning it once"""
+    scanner = _JsonObjectScanner()
+    end = scanner.feed(text)
+    if end is None:
+        return None
+    return text[scanner.start:end]
+
 
 class GroqScriptGenerator:
     """Generate Hinglish 2-person podcast scripts using Groq API"""
@@ -39,6 +182,21 @@ class GroqScriptGenerator:
         }
     }
     
+    # Audience-specific style lines, rendered once at class load
+    _STYLE_GUIDES = {
+        audience: f"- {profile['tone']}\n- Use: {profile['examples']}"
+        for audience, profile in AUDIENCE_PROFILES.items()
+    }
+    
+    MAX_OUTPUT_TOKENS = 8192
+    MAX_WIKI_CHARS = 1500
+    # Compressed article text, keyed by a digest of topic and content rather than the content itself
+    COMPRESSED_CACHE_SIZE = 128
+    _compressed = OrderedDict()
+    _compressed_lock = threading.Lock()
+    MIN_DURATION_MINUTES = 1
+    MAX_DURATION_MINUTES = 10
+    
     def __init__(self, api_key: str):
         if not api_key:
             raise ValueError("Groq API key is required")
@@ -47,111 +205,385 @@ class GroqScriptGenerator:
         self.api_url = "https://api.groq.com/openai/v1/chat/completions"
         self.model = "llama-3.3-70b-versatile"
         self.max_retries = 5
+        self.cache_dir = Path(os.getenv("SCRIPT_CACHE_DIR", ".script_cache"))
+    
+    @classmethod
+    def _max_tokens_for(cls, duration_minutes: int) -> int:
+        # ~150 spoken words per minute at ~1.6 tokens per word, plus room for the JSON scaffolding
+        return min(cls.MAX_OUTPUT_TOKENS, int(duration_minutes * 150 * 1.6) + 512)
+    
+    @classmethod
+    def _compress_wikipedia(cls, text: str, topic: str, budget_chars: Optional[int] = None) -> str:
+        """Keep the lead paragraph plus the most on-topic, fact-dense paragraphs within budget"""
+        budget_chars = budget_chars or cls.MAX_WIKI_CHARS
+        if len(text) <= budget_chars:
+            return text
+        
+        paragraphs = []
+        for block in _PARAGRAPH_BREAK_RE.split(text):
+            paragraph = "\n".join(line.strip() for line in block.splitlines() if line.strip())
+            if paragraph and not _is_heading(paragraph):
+                paragraphs.append(paragraph)
+        if not paragraphs:
+            return truncate_at_sentence(text.strip(), budget_chars)
+        lead = paragraphs[0]
+        if len(lead) >= budget_chars:
+            return truncate_at_sentence(lead, budget_chars)
+        
+        topic_tokens = [t for t in topic.casefold().split() if len(t) > 2]
+        
+        def score(index: int):
+            paragraph = paragraphs[index]
+            folded = paragraph.casefold()
+            mentions_topic = any(token in folded for token in topic_tokens)
+            digit_density = sum(ch.isdigit() for ch in paragraph) / len(paragraph)
+            return (mentions_topic, digit_density)
+        
+        used = len(lead)
+        selected = [0]
+        for index in sorted(range(1, len(paragraphs)), key=score, reverse=True):
+            cost = len(paragraphs[index]) + 2
+            if used + cost <= budget_chars:
+                selected.append(index)
+                used += cost
+        
+        return "\n\n".join(paragraphs[i] for i in sorted(selected))
     
-    def _build_prompt(self, topic: str, wikipedia_content: str, duration_minutes: int, style: str, audience: str) -> str:
-        profile = self.AUDIENCE_PROFILES.get(audience, self.AUDIENCE_PROFILES["Adults"])
+    @classmethod
+    def _compressed_content(cls, wikipedia_content: str, topic: str) -> str:
+        """Memoized _compress_wikipedia: retries and regenerations for the same article reuse the result"""
+        key = hashlib.blake2b(f"{topic}|{wikipedia_content}".encode("utf-8"), digest_size=16).digest()
+        with cls._compressed_lock:
+            if key in cls._compressed:
+                cls._compressed.move_to_end(key)
+                return cls._compressed[key]
+        compressed = cls._compress_wikipedia(wikipedia_content, topic)
+        with cls._compressed_lock:
+            cls._compressed[key] = compressed
+            if len(cls._compressed) > cls.COMPRESSED_CACHE_SIZE:
+                cls._compressed.popitem(last=False)
+        return compressed
+    
+    @classmethod
+    def _build_prompt(cls, topic: str, wikipedia_content: str, duration_minutes: int, style: str, audience: str) -> str:
+        style_guide = cls._STYLE_GUIDES.get(audience) or cls._STYLE_GUIDES["Adults"]
         num_turns = duration_minutes * 3
+        max_turns = num_turns + 1
         
-        prompt = f"""Create a {duration_minutes}-minute Hinglish podcast for {audience}.
-
-Topic: {topic}
-Content: {wikipedia_content[:1500]}
-
-Style Guide:
-- {profile['tone']}
-- Use: {profile['examples']}
-- Mix 60% Hindi, 40% English naturally
-- Add fillers: umm, toh, achha, *laughs*
-
-Return JSON only:
-{{
-  "title": "Engaging Hinglish title",
-  "dialogue": [
-    {{"speaker": "Rajesh", "text": "Namaste! Aaj baat karenge..."}},
-    {{"speaker": "Priya", "text": "Haan Rajesh, yeh topic interesting hai..."}}
-  ]
-}}
-
-Create {num_turns}-{num_turns+1} exchanges. Natural conversation, not Wikipedia reading."""
+        wikipedia_content = cls._compressed_content(wikipedia_content, topic)
         
-        return prompt
+        return _PROMPT_TEMPLATE.format(
+            duration_minutes=duration_minutes,
+            audience=audience,
+            topic=topic,
+            wikipedia_content=wikipedia_content,
+            style_guide=style_guide,
+            num_turns=num_turns,
+            max_turns=max_turns
+        )
     
-    def generate_script(self, topic: str, wikipedia_content: str, duration_minutes: int = 2, style: str = "Conversational", audience: str = "Adults") -> Dict:
+    @classmethod
+    def _build_batch_prompt(cls, topic: str, wikipedia_content: str, duration_minutes: int, style: str, audiences: Tuple[str, ...]) -> str:
+        # The source text appears once and is shared by every audience's script
+        profiles = []
+        for audience in audiences:
+            profile = cls.AUDIENCE_PROFILES.get(audience) or cls.AUDIENCE_PROFILES["Adults"]
+            profiles.append({"audience": audience, "tone": profile["tone"], "use": profile["examples"]})
+        num_turns = duration_minutes * 3
+        
+        return _BATCH_PROMPT_TEMPLATE.format(
+            count=len(audiences),
+            duration_minutes=duration_minutes,
+            topic=topic,
+            wikipedia_content=cls._compressed_content(wikipedia_content, topic),
+            audience_profiles=json.dumps(profiles, ensure_ascii=False, indent=2),
+            num_turns=num_turns,
+            max_turns=num_turns + 1
+        )
+    
+    def _validate_request(self, topic: str, wikipedia_content: str, duration_minutes: int) -> Optional[str]:
+        if not isinstance(topic, str) or not topic.strip():
+            return "Topic is required"
+        if not isinstance(wikipedia_content, str) or not wikipedia_content.strip():
+            return "Wikipedia content is required"
+        if isinstance(duration_minutes, bool) or not isinstance(duration_minutes, int):
+            return f"Duration must be a whole number of minutes, got {duration_minutes!r}"
+        if not self.MIN_DURATION_MINUTES <= duration_minutes <= self.MAX_DURATION_MINUTES:
+            return f"Duration must be between {self.MIN_DURATION_MINUTES} and {self.MAX_DURATION_MINUTES} minutes"
+        return None
+    
+    def _cache_path(self, topic: str, wikipedia_content: str, duration_minutes: int, style: str, audience: str) -> Path:
+        key = f"{self.model}|{topic}|{duration_minutes}|{style}|{audience}|{wikipedia_content}"
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+    
+    def _load_cached(self, cache_path: Path) -> Optional[Dict]:
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _store_cached(self, cache_path: Path, script_data: Dict) -> None:
+        # Unique per thread as well as per process: concurrent writers of one key never share a temp file
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(script_data, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.warning("cache_write_failed", extra={"path": str(cache_path), "error": str(e)})
+    
+    def _check_request(self, topic: str, wikipedia_content: str, duration_minutes: int, style: str, audience: str, use_cache: bool) -> Tuple[Optional[Dict], Optional[Path]]:
+        """Return an early result (invalid request or cache hit) and the request's cache path"""
+        invalid = self._validate_request(topic, wikipedia_content, duration_minutes)
+        if invalid:
+            return _error(ErrorCode.INVALID_REQUEST, invalid), None
+        
+        cache_path = self._cache_path(topic, wikipedia_content, duration_minutes, style, audience)
+        if use_cache:
+            cached = self._load_cached(cache_path)
+            if cached is not None:
+                return {"success": True, "cache_hit": True, **cached}, cache_path
+        
+        return None, cache_path
+    
+    def _accept_script(self, cache_path: Path, script_data: Dict) -> Optional[Dict]:
+        if not self._validate_script(script_data):
+            return None
+        self._store_cached(cache_path, script_data)
+        return {"success": True, **script_data}
+    
+    def _attempt(self, prompt: str, max_tokens: int, accept: Callable[[Dict], Optional[Dict]], attempt: int, log_fields: Dict) -> Tuple[Optional[Dict], float]:
+        """
+        Make one API call
+        
+        Args:
+            accept: Turns the parsed JSON into the success result, or returns None if its structure is invalid
+        
+        Returns:
+            (result, 0) when finished, or (None, seconds_to_wait) when the call should be retried
+        """
+        def retry_or_fail(error: Dict, delay: float) -> Tuple[Optional[Dict], float]:
+            if attempt < self.max_retries - 1:
+                return None, delay
+            return error, 0
+        
+        try:
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
+            
+            payload = {
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": "You are a Hinglish podcast writer. Return only valid JSON."},
+                    {"role": "user", "content": prompt}
+                ],
+                "temperature": 0.8,
+                "max_tokens": max_tokens,
+                "top_p": 0.9,
+                "stream": True
+            }
+            
+            response = requests.post(self.api_url, headers=headers, json=payload, timeout=60, stream=True)
+            
+            if response.status_code == 429:
+                error_data = response.json()
+                error_msg = error_data.get("error", {}).get("message", "")
+                wait_time = self._extract_wait_time(error_msg)
+                logger.warning("quota", extra={**log_fields, "attempt": attempt, "retry_after": wait_time})
+                return retry_or_fail(
+                    _error(ErrorCode.QUOTA_EXCEEDED, f"Rate limit exceeded. Please try again in {wait_time:.0f} seconds."),
+                    max(wait_time, (2 ** attempt))
+                )
+            
+            if response.status_code == 404:
+                logger.error("model_not_found", extra={**log_fields, "model": self.model})
+                return _error(ErrorCode.MODEL_NOT_FOUND, f"Model {self.model} is not available: {response.text}"), 0
+            
+            if response.status_code != 200:
+                logger.warning("api_error", extra={**log_fields, "attempt": attempt, "status_code": response.status_code})
+                return retry_or_fail(
+                    _error(ErrorCode.API_ERROR, f"API error {response.status_code}: {response.text}"),
+                    2 ** attempt
+                )
+            
+            script_text = self._read_stream(response).strip()
+            
+            script_data = self._extract_json(script_text)
+            
+            if not script_data:
+                logger.warning("parse_error", extra={**log_fields, "attempt": attempt})
+                return retry_or_fail(_error(ErrorCode.PARSE_ERROR, "Failed to parse JSON from AI response"), 1)
+            
+            result = accept(script_data)
+            if result is None:
+                logger.warning("invalid_script", extra={**log_fields, "attempt": attempt})
+                return retry_or_fail(_error(ErrorCode.INVALID_SCRIPT, "Invalid script structure"), 1)
+            
+            return result, 0
+        
+        except requests.exceptions.Timeout:
+            logger.warning("timeout", extra={**log_fields, "attempt": attempt})
+            return retry_or_fail(_error(ErrorCode.TIMEOUT, "Request timeout. Please try again."), 2 ** attempt)
+        except Exception as e:
+            logger.exception("unexpected_error", extra={**log_fields, "attempt": attempt})
+            return retry_or_fail(_error(ErrorCode.UNEXPECTED_ERROR, f"Error: {str(e)}"), 2 ** attempt)
+    
+    def generate_script(self, topic: str, wikipedia_content: str, duration_minutes: int = 2, style: str = "Conversational", audience: str = "Adults", use_cache: bool = True) -> Dict:
+        result, cache_path = self._check_request(topic, wikipedia_content, duration_minutes, style, audience, use_cache)
+        if result is not None:
+            return result
+        
         prompt = self._build_prompt(topic, wikipedia_content, duration_minutes, style, audience)
+        max_tokens = self._max_tokens_for(duration_minutes)
+        accept = functools.partial(self._accept_script, cache_path)
+        log_fields = {"topic": topic, "audience": audience}
         
         for attempt in range(self.max_retries):
-            try:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                payload = {
-                    "model": self.model,
-                    "messages": [
-                        {"role": "system", "content": "You are a Hinglish podcast writer. Return only valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "temperature": 0.8,
-                    "max_tokens": 3000,
-                    "top_p": 0.9
-                }
-                
-                response = requests.post(self.api_url, headers=headers, json=payload, timeout=60)
-                
-                if response.status_code == 429:
-                    error_data = response.json()
-                    error_msg = error_data.get("error", {}).get("message", "")
-                    wait_time = self._extract_wait_time(error_msg)
-                    
-                    if attempt < self.max_retries - 1:
-                        sleep_time = max(wait_time, (2 ** attempt))
-                        time.sleep(sleep_time)
-                        continue
-                    else:
-                        return {"success": False, "error": f"Rate limit exceeded. Please try again in {wait_time:.0f} seconds."}
-                
-                if response.status_code != 200:
-                    if attempt < self.max_retries - 1:
-                        time.sleep(2 ** attempt)
-                        continue
-                    return {"success": False, "error": f"API error {response.status_code}: {response.text}"}
-                
-                response_data = response.json()
-                script_text = response_data["choices"][0]["message"]["content"].strip()
-                
-                script_data = self._extract_json(script_text)
-                
-                if not script_data:
-                    if attempt < self.max_retries - 1:
-                        time.sleep(1)
-                        continue
-                    return {"success": False, "error": "Failed to parse JSON from AI response"}
-                
-                if not self._validate_script(script_data):
-                    if attempt < self.max_retries - 1:
-                        time.sleep(1)
-                        continue
-                    return {"success": False, "error": "Invalid script structure"}
-                
-                return {"success": True, **script_data}
+            result, retry_after = self._attempt(prompt, max_tokens, accept, attempt, log_fields)
+            if result is not None:
+                return result
+            time.sleep(retry_after)
+        
+        return _error(ErrorCode.RETRIES_EXHAUSTED, "Failed after multiple retries. Please try again later.")
+    
+    def generate_scripts_batch(self, topic: str, wikipedia_content: str, duration_minutes: int = 2, style: str = "Conversational", audiences: Optional[List[str]] = None, use_cache: bool = True) -> Dict[str, Dict]:
+        """
+        Generate one script per audience for the same article, several per API call
+        
+        Args:
+            audiences: Audiences to write for (default: every AUDIENCE_PROFILES entry)
+            
+        Returns:
+            Mapping of audience to its generate_script-style result
+        """
+        audiences = list(dict.fromkeys(audiences or self.AUDIENCE_PROFILES))
+        results = {}
+        cache_paths = {}
+        for audience in audiences:
+            result, cache_path = self._check_request(topic, wikipedia_content, duration_minutes, style, audience, use_cache)
+            if result is not None:
+                results[audience] = result
+            else:
+                cache_paths[audience] = cache_path
+        
+        pending = list(cache_paths)
+        per_script_tokens = self._max_tokens_for(duration_minutes)
+        batch_size = max(1, self.MAX_OUTPUT_TOKENS // per_script_tokens)
+        
+        for i in range(0, len(pending), batch_size):
+            group = pending[i:i + batch_size]
+            if len(group) == 1:
+                results[group[0]] = self.generate_script(topic, wikipedia_content, duration_minutes, style, group[0], use_cache=False)
+                continue
+            
+            prompt = self._build_batch_prompt(topic, wikipedia_content, duration_minutes, style, tuple(group))
+            max_tokens = min(self.MAX_OUTPUT_TOKENS, per_script_tokens * len(group))
+            
+            def accept(batch_data: Dict, group: List[str] = group) -> Optional[Dict]:
+                scripts = batch_data.get("scripts")
+                if not isinstance(scripts, list) or len(scripts) != len(group):
+                    return None
+                scripts = [{k: v for k, v in script.items() if k != "audience"} if isinstance(script, dict) else script for script in scripts]
+                if not all(self._validate_script(script) for script in scripts):
+                    return None
+                for audience, script_data in zip(group, scripts):
+                    self._store_cached(cache_paths[audience], script_data)
+                return {"success": True, "scripts": scripts}
+            
+            log_fields = {"topic": topic, "audiences": group}
+            result = _error(ErrorCode.RETRIES_EXHAUSTED, "Failed after multiple retries. Please try again later.")
+            for attempt in range(self.max_retries):
+                batch_result, retry_after = self._attempt(prompt, max_tokens, accept, attempt, log_fields)
+                if batch_result is not None:
+                    result = batch_result
+                    break
+                time.sleep(retry_after)
+            
+            if result["success"]:
+                for audience, script_data in zip(group, result["scripts"]):
+                    results[audience] = {"success": True, **script_data}
+            else:
+                for audience in group:
+                    results[audience] = result
+        
+        return {audience: results[audience] for audience in audiences}
+    
+    async def generate_script_async(self, topic: str, wikipedia_content: str, duration_minutes: int = 2, style: str = "Conversational", audience: str = "Adults", use_cache: bool = True) -> Dict:
+        """Async generate_script: API calls run in a worker thread and back-off never blocks the event loop"""
+        result, cache_path = self._check_request(topic, wikipedia_content, duration_minutes, style, audience, use_cache)
+        if result is not None:
+            return result
+        
+        prompt = self._build_prompt(topic, wikipedia_content, duration_minutes, style, audience)
+        max_tokens = self._max_tokens_for(duration_minutes)
+        accept = functools.partial(self._accept_script, cache_path)
+        log_fields = {"topic": topic, "audience": audience}
+        
+        for attempt in range(self.max_retries):
+            result, retry_after = await asyncio.to_thread(self._attempt, prompt, max_tokens, accept, attempt, log_fields)
+            if result is not None:
+                return result
+            await asyncio.sleep(retry_after)
+        
+        return _error(ErrorCode.RETRIES_EXHAUSTED, "Failed after multiple retries. Please try again later.")
+    
+    async def generate_scripts_async(self, jobs: List[Dict], max_concurrency: int = 4) -> List[Dict]:
+        """
+        Generate several scripts concurrently
+        
+        Args:
+            jobs: List of generate_script keyword-argument dicts
+            max_concurrency: Maximum number of requests in flight
             
-            except requests.exceptions.Timeout:
-                if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)
+        Returns:
+            One result dict per job, in order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(job: Dict) -> Dict:
+            async with semaphore:
+                return await self.generate_script_async(**job)
+        
+        results = await asyncio.gather(*(run(job) for job in jobs), return_exceptions=True)
+        return [
+            _error(ErrorCode.UNEXPECTED_ERROR, f"Error: {result}") if isinstance(result, BaseException) else result
+            for result in results
+        ]
+    
+    def _read_stream(self, response) -> str:
+        """Accumulate streamed content, stopping as soon as the JSON object closes"""
+        parts = []
+        scanner = _JsonObjectScanner()
+        try:
+            for line in response.iter_lines():
+                if not line.startswith(b"data: "):
                     continue
-                return {"success": False, "error": "Request timeout. Please try again."}
-            except Exception as e:
-                if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)
+                data = line[len(b"data: "):]
+                if data == b"[DONE]":
+                    break
+                
+                delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                if not delta:
                     continue
-                return {"success": False, "error": f"Error: {str(e)}"}
+                parts.append(delta)
+                
+                end = scanner.feed(delta)
+                if end is not None:
+                    return "".join(parts)[:end]
+        finally:
+            response.close()
         
-        return {"success": False, "error": "Failed after multiple retries. Please try again later."}
+        return "".join(parts)
     
     def _extract_wait_time(self, error_message: str) -> float:
         try:
-            match = re.search(r'(\d+(?:\.\d+)?)\s*(ms|s)', error_message.lower())
+            match = _WAIT_TIME_RE.search(error_message.lower())
             if match:
                 value = float(match.group(1))
                 unit = match.group(2)
@@ -163,42 +595,37 @@ Create {num_turns}-{num_turns+1} exchanges. Natural conversation, not Wikipedia
         return 1.0
     
     def _extract_json(self, text: str) -> Optional[Dict]:
+        if "{" not in text:
+            return None
+        
+        text = text.strip()
+        if text.startswith("```"):
+            # Skip the opening ```json fence line; the balanced scan ignores the closing one
+            text = text[text.find("\n") + 1:]
+        
+        if text.startswith("{"):
+            try:
+                return json.loads(text)
+            except json.JSONDecodeError:
+                pass
+        
+        candidate = _find_balanced_json(text)
+        if candidate is None:
+            return None
         try:
-            return json.loads(text)
+            return json.loads(candidate)
         except json.JSONDecodeError:
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', text, re.DOTALL)
-            if json_match:
-                try:
-                    return json.loads(json_match.group(1))
-                except:
-                    pass
-            
-            json_match = re.search(r'\{.*\}', text, re.DOTALL)
-            if json_match:
-                try:
-                    return json.loads(json_match.group(0))
-                except:
-                    pass
-            
             return None
     
     def _validate_script(self, script_data: Dict) -> bool:
         if not isinstance(script_data, dict):
             return False
         
-        if "dialogue" not in script_data:
+        dialogue = script_data.get("dialogue")
+        if not isinstance(dialogue, list) or len(dialogue) < 2:
             return False
         
-        if not isinstance(script_data["dialogue"], list):
-            return False
-        
-        if len(script_data["dialogue"]) < 2:
-            return False
-        
-        for turn in script_data["dialogue"]:
-            if not isinstance(turn, dict):
-                return False
-            if "speaker" not in turn or "text" not in turn:
-                return False
-        
-        return True
+        return all(
+            isinstance(turn, dict) and "speaker" in turn and "text" in turn
+            for turn in dialogue
+        )
@@ -2,16 +2,18 @@
 Text-to-Speech engine supporting Bark and ElevenLabs
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List
-import numpy as np
-from scipy.io import wavfile
 from src.config import Config
 from src.personas import get_persona
 
 class TTSEngine:
     """Text-to-Speech conversion using Bark or ElevenLabs"""
     
+    # Concurrent segment requests for API-backed engines
+    MAX_PARALLEL_REQUESTS = 8
+    
     def __init__(self, engine: str = "bark"):
         """
         Initialize TTS engine
@@ -32,8 +34,10 @@ class TTSEngine:
         """Initialize Bark TTS"""
         try:
             from bark import SAMPLE_RATE, generate_audio, preload_models
+            import soundfile
             
             self.bark_generate = generate_audio
+            self.write_wav = soundfile.write
             self.bark_sample_rate = SAMPLE_RATE
             
             # Preload models for faster generation
@@ -42,7 +46,7 @@ class TTSEngine:
             print("✅ Bark models loaded")
             
         except ImportError:
-            raise ImportError("Bark not installed. Run: pip install bark")
+            raise ImportError("Bark not installed. Run: pip install bark soundfile")
     
     def _init_elevenlabs(self):
         """Initialize ElevenLabs TTS"""
@@ -87,11 +91,12 @@ class TTSEngine:
                 history_prompt=voice_preset
             )
             
-            # Save to file
-            wavfile.write(
+            # Save to file as 16-bit PCM
+            self.write_wav(
                 str(output_path),
+                audio_array,
                 self.bark_sample_rate,
-                audio_array
+                subtype='PCM_16'
             )
             
             return True
@@ -153,8 +158,10 @@ class TTSEngine:
         Returns:
             Success status
         """
-        persona = get_persona(audience, speaker)
-        
+        return self._generate_segment_with_persona(get_persona(audience, speaker), dialogue, output_path)
+    
+    def _generate_segment_with_persona(self, persona: dict, dialogue: str, output_path: Path) -> bool:
+        """Generate audio for a dialogue segment whose persona is already resolved"""
         if self.engine == "bark":
             voice_preset = persona['bark_voice']
             return self.generate_speech_bark(dialogue, voice_preset, output_path)
@@ -165,6 +172,26 @@ class TTSEngine:
         
         return False
     
+    def _generate_segment(
+        self,
+        index: int,
+        segment: dict,
+        persona: dict,
+        output_dir: Path,
+        total: int
+    ) -> Optional[Path]:
+        """Generate one conversation segment, returning its path on success"""
+        output_path = output_dir / f"segment_{index:03d}_{segment['speaker']}.wav"
+        
+        success = self._generate_segment_with_persona(persona, segment['dialogue'], output_path)
+        
+        if success:
+            print(f"✅ Generated segment {index+1}/{total}")
+            return output_path
+        
+        print(f"❌ Failed to generate segment {index+1}")
+        return None
+    
     def generate_full_conversation(
         self,
         segments: List[dict],
@@ -183,53 +210,18 @@ class TTSEngine:
             List of generated audio file paths
         """
         output_dir.mkdir(parents=True, exist_ok=True)
-        audio_files = []
         
-        for i, segment in enumerate(segments):
-            output_path = output_dir / f"segment_{i:03d}_{segment['speaker']}.wav"
-            
-            success = self.generate_dialogue_segment(
-                dialogue=segment['dialogue'],
-                speaker=segment['speaker'],
-                audience=audience,
-                output_path=output_path
-            )
-            
-            if success:
-                audio_files.append(output_path)
-                print(f"✅ Generated segment {i+1}/{len(segments)}")
-            else:
-                print(f"❌ Failed to generate segment {i+1}")
+        # Audience is fixed for the conversation, so there is one persona per speaker
+        personas = {speaker: get_persona(audience, speaker) for speaker in {s['speaker'] for s in segments}}
         
-        return audio_files
-
-
-# Example usage
-if __name__ == "__main__":
-    # Test Bark TTS
-    tts = TTSEngine(engine="bark")
-    
-    test_segments = [
-        {
-            "speaker": "male",
-            "speaker_name": "BOY",
-            "dialogue": "Arey yaar, ChatGPT ke baare mein suna hai? [excited]"
-        },
-        {
-            "speaker": "female",
-            "speaker_name": "GIRL",
-            "dialogue": "Haan! Wo toh bahut cool hai! [giggles]"
-        }
-    ]
-    
-    output_dir = Config.TEMP_DIR / "test_audio"
-    
-    audio_files = tts.generate_full_conversation(
-        segments=test_segments,
-        audience="kids",
-        output_dir=output_dir
-    )
-    
-    print(f"\n✅ Generated {len(audio_files)} audio files")
-    for file in audio_files:
-        print(f"  - {file}")
+        # Bark shares one local model, so only network-bound engines fan out
+        workers = 1 if self.engine == "bark" else self.MAX_PARALLEL_REQUESTS
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._generate_segment, i, segment, personas[segment['speaker']], output_dir, len(segments))
+                for i, segment in enumerate(segments)
+            ]
+            results = [future.result() for future in futures]
+        
+        return [path for path in results if path is not None]
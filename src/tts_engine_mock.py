@@ -1,32 +1,52 @@
 # src/tts_engine_mock.py
 """Mock TTS engine for testing"""
-import numpy as np
-from scipy.io import wavfile
 import os
-import io
+import struct
+
+_SAMPLE_RATE = 22050
+
+# 44-byte RIFF header for mono 16-bit PCM; only the two size fields vary per file
+_WAV_HEADER_TEMPLATE = struct.pack(
+    '<4sI4s4sIHHIIHH4sI',
+    b'RIFF', 0, b'WAVE',
+    b'fmt ', 16, 1, 1, _SAMPLE_RATE, _SAMPLE_RATE * 2, 2, 16,
+    b'data', 0
+)
 
 class MockTTSEngine:
     """Mock TTS engine that generates silence"""
     
     def __init__(self):
-        self.sample_rate = 22050
+        self.sample_rate = _SAMPLE_RATE
         
-    def generate_speech(self, text: str, voice: str = "default") -> bytes:
-        """Generate mock audio (silence) for testing"""
+    def _data_size(self, text: str) -> int:
         duration = max(2.0, len(text) / 50)
-        num_samples = int(self.sample_rate * duration)
-        audio_data = np.zeros(num_samples, dtype=np.int16)
+        return int(self.sample_rate * duration) * 2
+    
+    def _wav_header(self, data_size: int) -> bytes:
+        header = bytearray(_WAV_HEADER_TEMPLATE)
+        struct.pack_into('<I', header, 4, 36 + data_size)
+        struct.pack_into('<I', header, 40, data_size)
+        if self.sample_rate != _SAMPLE_RATE:
+            struct.pack_into('<II', header, 24, self.sample_rate, self.sample_rate * 2)
+        return bytes(header)
         
-        buffer = io.BytesIO()
-        wavfile.write(buffer, self.sample_rate, audio_data)
-        buffer.seek(0)
-        return buffer.read()
+    def generate_speech(self, text: str, voice: str = "default") -> bytes:
+        """Generate mock audio (silence) for testing"""
+        data_size = self._data_size(text)
+        return self._wav_header(data_size) + b'\x00' * data_size
     
     def synthesize(self, text: str, output_path: str, voice: str = "default") -> str:
         """Generate speech and save to file"""
-        audio_bytes = self.generate_speech(text, voice)
+        data_size = self._data_size(text)
+        header = self._wav_header(data_size)
         os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
         
-        with open(output_path, 'wb') as f:
-            f.write(audio_bytes)
+        # Extending with ftruncate leaves the silent samples as a sparse hole instead of writing zeros
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            os.write(fd, header)
+            os.ftruncate(fd, len(header) + data_size)
+        finally:
+            os.close(fd)
         return output_path
@@ -1,10 +1,23 @@
 """
 Utility functions for the application
 """
+import os
 import re
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
+
+_TS_FMT = "%Y%m%d_%H%M%S"
+_DEFAULT_WPM = 150
+_FN_BAD = re.compile(r'[^\w\s-]')
+_FN_WS = re.compile(r'\s+')
+
+# ASCII filename table: lowercases word characters, turns whitespace into spaces, drops the rest
+_FN_ASCII = {
+    i: (chr(i).lower() if chr(i).isalnum() or chr(i) in '_-' else ' ' if chr(i).isspace() else None)
+    for i in range(128)
+}
 
 def sanitize_filename(text: str, max_length: int = 50) -> str:
     """
@@ -17,14 +30,20 @@ def sanitize_filename(text: str, max_length: int = 50) -> str:
     Returns:
         Sanitized filename
     """
-    # Remove special characters
-    text = re.sub(r'[^\w\s-]', '', text)
-    
-    # Replace spaces with underscores
-    text = re.sub(r'\s+', '_', text)
-    
-    # Convert to lowercase
-    text = text.lower()
+    if text.isascii():
+        # Clean and lowercase in one translate pass
+        text = text.translate(_FN_ASCII)
+        if ' ' in text:
+            text = _FN_WS.sub('_', text)
+    else:
+        # Remove special characters
+        text = _FN_BAD.sub('', text)
+        
+        # Replace spaces with underscores
+        text = _FN_WS.sub('_', text)
+        
+        # Convert to lowercase
+        text = text.lower()
     
     # Truncate if too long
     if len(text) > max_length:
@@ -32,7 +51,7 @@ def sanitize_filename(text: str, max_length: int = 50) -> str:
     
     return text
 
-def generate_output_filename(topic: str, audience: str, tone: str) -> str:
+def generate_output_filename(topic: str, audience: str, tone: str, now: Optional[datetime] = None) -> str:
     """
     Generate output filename for audio
     
@@ -40,12 +59,13 @@ def generate_output_filename(topic: str, audience: str, tone: str) -> str:
         topic: Wikipedia topic
         audience: Target audience
         tone: Conversation tone
+        now: Timestamp to use (default: current time); share one across a batch
         
     Returns:
         Filename string
     """
     topic_clean = sanitize_filename(topic, max_length=30)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = (now or datetime.now()).strftime(_TS_FMT)
     
     return f"{topic_clean}_{audience}_{tone}_{timestamp}.mp3"
 
@@ -75,7 +95,25 @@ def count_words(text: str) -> int:
     """
     return len(text.split())
 
-def estimate_audio_duration(word_count: int, words_per_minute: int = 150) -> float:
+def truncate_at_sentence(text: str, max_length: int) -> str:
+    """
+    Cut text to max_length, preferring to end on a full stop near the limit
+    
+    Args:
+        text: Input text
+        max_length: Maximum characters to return
+        
+    Returns:
+        Text ending on a full stop within the last 20% of max_length, else hard-cut
+    """
+    if len(text) <= max_length:
+        return text
+    cut = text.rfind('.', 0, max_length)
+    if cut > int(max_length * 0.8):
+        return text[:cut + 1]
+    return text[:max_length]
+
+def estimate_audio_duration(word_count: int, words_per_minute: int = _DEFAULT_WPM) -> float:
     """
     Estimate audio duration from word count
     
@@ -86,7 +124,7 @@ def estimate_audio_duration(word_count: int, words_per_minute: int = 150) -> flo
     Returns:
         Estimated duration in seconds
     """
-    return (word_count / words_per_minute) * 60
+    return word_count * 60 / words_per_minute
 
 def save_script_to_file(script: str, output_path: Path) -> bool:
     """
@@ -99,16 +137,29 @@ def save_script_to_file(script: str, output_path: Path) -> bool:
     Returns:
         Success status
     """
+    tmp_name = None
     try:
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        data = script.encode('utf-8')
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(script)
+        # Write beside the target and swap it in, so readers never see a partial file;
+        # open() creates the temp file 0666 minus the umask, like a direct write would
+        tmp_name = output_path.with_name(f".{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_name, 'xb') as tmp:
+            tmp.write(data)
+        # Keep the mode of a script being overwritten
+        try:
+            os.chmod(tmp_name, os.stat(output_path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_name, output_path)
         
         return True
         
     except Exception as e:
         print(f"Error saving script: {e}")
+        if tmp_name is not None:
+            tmp_name.unlink(missing_ok=True)
         return False
 
 def create_metadata_dict(
@@ -118,13 +169,15 @@ def create_metadata_dict(
     word_count: int,
     duration: float,
     script_path: str,
-    audio_path: str
+    audio_path: str,
+    now: Optional[datetime] = None
 ) -> Dict:
     """
     Create metadata dictionary for generated content
     
     Args:
         Various metadata fields
+        now: Generation time (default: current time); pass the one used for the filename
         
     Returns:
         Metadata dictionary
@@ -138,5 +191,5 @@ def create_metadata_dict(
         "duration_formatted": format_duration(duration),
         "script_path": script_path,
         "audio_path": audio_path,
-        "generated_at": datetime.now().isoformat()
+        "generated_at": (now or datetime.now()).isoformat()
     }
@@ -0,0 +1,8 @@
+"""
+Wikipedia Fetcher
+WikipediaHandler provides the fetcher API; this name is kept for existing imports
+"""
+
+from src.wikipedia_handler import WikipediaHandler as WikipediaFetcher
+
+__all__ = ['WikipediaFetcher']
@@ -1,21 +1,127 @@
 """
 Wikipedia API Handler
-Searches and fetches Wikipedia article content
+Searches and fetches Wikipedia article content, and prepares it for script generation
 """
 
+import asyncio
+import functools
+import hashlib
+import html
+import json
+import os
 import requests
-from typing import List, Dict, Optional
+import threading
+import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.utils import truncate_at_sentence
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import quote
+from typing import Any, ClassVar, Hashable, List, Dict, Optional, Tuple
 import re
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+_TAG_RE = re.compile(r'<[^>]+>')
+# A run of whitespace, [n] references and == headings ==, cleaned in one pass
+_CLEAN_RE = re.compile(r'(?:\s+|\[\d+\]|==+[^=\n]*==+)+')
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Query parameters for one whole article as plain text (add "titles")
+_EXTRACT_PARAMS = {
+    "action": "query",
+    "format": "json",
+    "formatversion": 2,
+    "prop": "extracts",
+    "explaintext": 1,
+    "exsectionformat": "plain",
+    "redirects": 1,
+}
+
+@functools.lru_cache(maxsize=1024)
+def _article_url(title: str) -> str:
+    """Canonical article URL; characters unsafe in a URL path (?, #, %, ...) are percent-encoded"""
+    return "https://en.wikipedia.org/wiki/" + quote(title.replace(' ', '_'), safe="/:(),'!*")
+
+class _LRUCache:
+    """Small thread-safe least-recently-used cache"""
+    
+    __slots__ = ("maxsize", "_data", "_lock")
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
 class WikipediaHandler:
     """Handler for Wikipedia API interactions"""
     
+    __slots__ = ("api_url", "headers", "session", "cache_dir", "_search_cache", "_article_cache", "_title_to_pageid", "_etags", "_disk_etags", "_disk_lock")
+    
+    CACHE_SIZE = 128
+    SUMMARY_SENTENCES = 3
+    MAX_SUMMARY_CHARS = 500
+    MAX_KEY_FACTS_CHARS = 1500
+    # Cached articles older than this are revalidated with their ETag
+    ARTICLE_MAX_AGE = 3600
+    # MediaWiki returns at most 20 intro extracts per query
+    BATCH_SIZE = 20
+    # On-disk ETag entries: at most this many files, each dropped after this many seconds
+    ETAG_CACHE_FILES = 512
+    ETAG_CACHE_MAX_AGE = 7 * 24 * 3600
+    
+    _SESSION: ClassVar[Optional[requests.Session]] = None
+    _SESSION_LOCK = threading.Lock()
+    
+    @classmethod
+    def _shared_session(cls, headers: Dict[str, str]) -> requests.Session:
+        """Return the process-wide pooled session, creating it on first use"""
+        # Keep-alive connections are reused by every handler, skipping a TCP/TLS handshake per request
+        with cls._SESSION_LOCK:
+            if cls._SESSION is None:
+                session = requests.Session()
+                session.headers.update(headers)
+                retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False)
+                session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+                cls._SESSION = session
+            return cls._SESSION
+    
     def __init__(self):
         """Initialize Wikipedia handler"""
-        self.base_url = "https://en.wikipedia.org/api/rest_v1"
+        self.api_url = "https://en.wikipedia.org/w/api.php"
         self.headers = {
             "User-Agent": "SynthRadioHost/1.0 (Educational Podcast Generator)"
         }
+        self.session = self._shared_session(self.headers)
+        # Successful lookups only, so transient failures are retried on the next call
+        self._search_cache = _LRUCache(self.CACHE_SIZE)
+        # Articles are stored once per pageid; every title seen for a page points at it
+        self._article_cache = _LRUCache(self.CACHE_SIZE)
+        self._title_to_pageid = _LRUCache(self.CACHE_SIZE * 4)
+        self._etags = _LRUCache(self.CACHE_SIZE)
+        # ETag-validated bodies also persist on disk, so a restart can revalidate instead of re-downloading
+        self.cache_dir = Path(os.getenv("WIKI_CACHE_DIR", ".wiki_cache"))
+        # File name -> mtime of the on-disk entries, scanned once so misses need no disk access
+        self._disk_etags: Optional[Dict[str, float]] = None
+        self._disk_lock = threading.Lock()
     
     def search_topics(self, query: str, limit: int = 10) -> List[Dict]:
         """
@@ -28,10 +134,13 @@ class WikipediaHandler:
         Returns:
             List of dicts with title, description, url
         """
+        cache_key = (query.strip().casefold(), limit)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         try:
             # Use MediaWiki API for search
-            search_url = "https://en.wikipedia.org/w/api.php"
-            
             params = {
                 "action": "query",
                 "format": "json",
@@ -41,30 +150,17 @@ class WikipediaHandler:
                 "srprop": "snippet"
             }
             
-            response = requests.get(
-                search_url,
+            response = self.session.get(
+                self.api_url,
                 params=params,
-                headers=self.headers,
                 timeout=10
             )
             
             if response.status_code != 200:
                 return []
             
-            data = response.json()
-            
-            results = []
-            for item in data.get("query", {}).get("search", []):
-                # Clean HTML tags from snippet
-                snippet = re.sub(r'<.*?>', '', item.get("snippet", ""))
-                
-                results.append({
-                    "title": item.get("title", ""),
-                    "description": snippet,
-                    "url": f"https://en.wikipedia.org/wiki/{item.get('title', '').replace(' ', '_')}"
-                })
-            
-            return results
+            data = _json_loads(response.content)
+            return list(self._store_search(cache_key, data.get("query", {})))
         
         except Exception as e:
             print(f"Search error: {e}")
@@ -82,49 +178,346 @@ class WikipediaHandler:
             Plain text content (string)
         """
         try:
-            # Use REST API for content
-            url = f"{self.base_url}/page/summary/{title.replace(' ', '_')}"
+            _, content = self._fetch_extract(title)
+            
+            # Limit to max_chars
+            if len(content) > max_chars:
+                content = content[:max_chars] + "..."
+            
+            # Return as string
+            return content
+        
+        except Exception as e:
+            print(f"Error fetching article: {e}")
+            return ""
+    
+    def _etag_path(self, params: Dict) -> Path:
+        key = json.dumps(params, sort_keys=True)
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+    
+    def _disk_index(self) -> Dict[str, float]:
+        """Entries in cache_dir by mtime, expiring old ones on the first scan; call with _disk_lock held"""
+        if self._disk_etags is None:
+            self._disk_etags = {}
+            cutoff = time.time() - self.ETAG_CACHE_MAX_AGE
+            try:
+                with os.scandir(self.cache_dir) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith(".json"):
+                            continue
+                        mtime = entry.stat().st_mtime
+                        if mtime < cutoff:
+                            Path(entry.path).unlink(missing_ok=True)
+                        else:
+                            self._disk_etags[entry.name] = mtime
+            except OSError:
+                pass
+        return self._disk_etags
+    
+    def _load_etag(self, path: Path) -> Optional[Tuple[str, Dict]]:
+        with self._disk_lock:
+            mtime = self._disk_index().get(path.name)
+        if mtime is None or time.time() - mtime > self.ETAG_CACHE_MAX_AGE:
+            return None
+        try:
+            with open(path, "rb") as f:
+                entry = _json_loads(f.read())
+            return entry["etag"], entry["data"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def _store_etag(self, path: Path, etag: str, data: Dict) -> None:
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"etag": etag, "data": data}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"ETag cache write failed: {e}")
+            return
+        
+        with self._disk_lock:
+            index = self._disk_index()
+            index[path.name] = time.time()
+            # Evict the oldest files once over the cap
+            excess = len(index) - self.ETAG_CACHE_FILES
+            if excess > 0:
+                for name in sorted(index, key=index.get)[:excess]:
+                    (self.cache_dir / name).unlink(missing_ok=True)
+                    del index[name]
+    
+    def _conditional_get(self, params: Dict) -> Optional[Dict]:
+        """GET the API, sending If-None-Match for a seen request; returns the parsed body or None on failure"""
+        key = tuple(sorted(params.items()))
+        known = self._etags.get(key)
+        path = self._etag_path(params)
+        if known is None:
+            known = self._load_etag(path)
+        headers = {"If-None-Match": known[0]} if known else None
+        
+        response = self.session.get(
+            self.api_url,
+            params=params,
+            headers=headers,
+            timeout=10
+        )
+        
+        # 304 Not Modified: the body we parsed last time is still current
+        if response.status_code == 304 and known:
+            self._etags.put(key, known)
+            return known[1]
+        if response.status_code != 200:
+            return None
+        
+        data = _json_loads(response.content)
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etags.put(key, (etag, data))
+            self._store_etag(path, etag, data)
+        return data
+    
+    def _fetch_extract(self, title: str) -> Tuple[str, str]:
+        """Return (resolved title, full plain-text extract); the extract is "" if the page is missing"""
+        pageid = self._title_to_pageid.get(title.replace(' ', '_'))
+        cached = self._article_cache.get(pageid) if pageid is not None else None
+        if cached is not None and time.monotonic() - cached[2] < self.ARTICLE_MAX_AGE:
+            return cached[0], cached[1]
+        
+        # One query returns the whole article as plain text
+        params = dict(_EXTRACT_PARAMS, titles=title)
+        
+        data = self._conditional_get(params)
+        if data is None:
+            return title, ""
+        
+        return self._store_extract(title, data.get("query", {}))
+    
+    def _store_search(self, cache_key: Tuple, query: Dict) -> List[Dict]:
+        """Build search results from a list=search response, caching them if any"""
+        results = []
+        for item in query.get("search", []):
+            # Clean HTML tags and entities from snippet
+            snippet = html.unescape(_TAG_RE.sub('', item.get("snippet", "")))
+            
+            results.append({
+                "title": item.get("title", ""),
+                "description": snippet,
+                "url": _article_url(item.get("title", ""))
+            })
+        
+        if results:
+            self._search_cache.put(cache_key, results)
+        return results
+    
+    def _store_extract(self, title: str, query: Dict) -> Tuple[str, str]:
+        """Read the single page of a prop=extracts response, caching it under every alias"""
+        pages = query.get("pages", [])
+        
+        # Missing pages have no extract
+        resolved = pages[0].get("title", title) if pages else title
+        content = pages[0].get("extract", "") if pages else ""
+        pageid = pages[0].get("pageid") if pages else None
+        if content and pageid is not None:
+            self._article_cache.put(pageid, (resolved, content, time.monotonic()))
+            # The requested title, its normalized form and redirect sources all alias this page
+            aliases = {title, resolved}
+            for item in query.get("normalized", []) + query.get("redirects", []):
+                aliases.update((item["from"], item["to"]))
+            for alias in aliases:
+                self._title_to_pageid.put(alias.replace(' ', '_'), pageid)
+        return resolved, content
+    
+    def fetch_article(self, topic: str) -> Optional[Dict]:
+        """
+        Fetch a full article
+        
+        Args:
+            topic: Article title
+            
+        Returns:
+            Dict with title, summary, content, url, or None if not found
+        """
+        try:
+            title, content = self._fetch_extract(topic)
+        except Exception as e:
+            print(f"Error fetching article: {e}")
+            return None
+        
+        if not content:
+            return None
+        
+        lead = content.split('\n', 1)[0]
+        summary = ' '.join(_SENTENCE_END_RE.split(lead, maxsplit=self.SUMMARY_SENTENCES)[:self.SUMMARY_SENTENCES])
+        
+        return {
+            "title": title,
+            "summary": summary,
+            "content": content,
+            "url": _article_url(title)
+        }
+    
+    def extract_key_facts(self, content: str, max_length: int = 1500) -> str:
+        """
+        Clean article text and trim it for use as script context
+        
+        Args:
+            content: Article text
+            max_length: Maximum characters to return
             
-            response = requests.get(
-                url,
-                headers=self.headers,
+        Returns:
+            Text without references, headings or repeated whitespace
+        """
+        if not content:
+            return ""
+        if '[' not in content and '==' not in content:
+            # Plain-text extracts usually have no markup left: only whitespace needs collapsing
+            content = ' '.join(content.split())
+        else:
+            # Runs containing whitespace become one space; bare references vanish
+            content = _CLEAN_RE.sub(lambda m: ' ' if any(ch.isspace() for ch in m.group()) else '', content).strip()
+        return truncate_at_sentence(content, max_length)
+    
+    def get_article_for_script(self, topic: str) -> Optional[Dict]:
+        """
+        Fetch an article and condense it for script generation
+        
+        Args:
+            topic: Article title
+            
+        Returns:
+            Dict with title, summary, key_facts, url, or None if not found
+        """
+        article = self.fetch_article(topic)
+        if article is None:
+            return None
+        
+        return {
+            "title": article["title"],
+            "summary": truncate_at_sentence(article["summary"], self.MAX_SUMMARY_CHARS),
+            "key_facts": self.extract_key_facts(article["content"], self.MAX_KEY_FACTS_CHARS),
+            "url": article["url"]
+        }
+    
+    def search_and_prefetch(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Search while speculatively fetching the top result's article
+        
+        Both run as one combined API query. The prefetched text lands in the
+        article cache, so selecting the top result afterwards needs no
+        further request.
+        
+        Args:
+            query: Search query
+            limit: Maximum number of results
+            
+        Returns:
+            Search results, as from search_topics
+        """
+        cache_key = (query.strip().casefold(), limit)
+        # A cached search was prefetched when it was first made: answer it without any request
+        if not query.strip() or self._search_cache.get(cache_key) is not None:
+            return self.search_topics(query, limit)
+        
+        # list=search ranks the results; generator=search with gsrlimit=1 feeds the top hit to prop=extracts
+        params = dict(
+            _EXTRACT_PARAMS,
+            list="search", srsearch=query, srlimit=limit, srprop="snippet",
+            generator="search", gsrsearch=query, gsrlimit=1
+        )
+        try:
+            response = self.session.get(
+                self.api_url,
+                params=params,
                 timeout=10
             )
             
-            if response.status_code == 200:
-                data = response.json()
+            if response.status_code != 200:
+                return []
+            
+            data = _json_loads(response.content).get("query", {})
+            results = self._store_search(cache_key, data)
+            # File the page under its own title: the generator's hit can differ from list=search's top result
+            pages = data.get("pages", [])
+            if pages and pages[0].get("title"):
+                self._store_extract(pages[0]["title"], data)
+            return list(results)
+        
+        except Exception as e:
+            print(f"Search error: {e}")
+            return []
+    
+    async def fetch_articles_async(self, topics: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch several full articles concurrently
+        
+        Each fetch runs in a worker thread over the pooled session, so the
+        round-trips overlap instead of queueing one after another.
+        
+        Args:
+            topics: Article titles
+            
+        Returns:
+            Dict of requested title to article (as from fetch_article) or None
+        """
+        unique = list(dict.fromkeys(topics))
+        articles = await asyncio.gather(*(asyncio.to_thread(self.fetch_article, topic) for topic in unique))
+        return dict(zip(unique, articles))
+    
+    def get_articles_content(self, titles: List[str], max_chars: int = 5000) -> Dict[str, str]:
+        """
+        Get the lead section of several articles, batching titles per request
+        
+        Args:
+            titles: Article titles
+            max_chars: Maximum characters per article
+            
+        Returns:
+            Dict of requested title to plain text lead ("" if missing)
+        """
+        contents = {title: "" for title in titles}
+        unique = list(contents)
+        
+        for i in range(0, len(unique), self.BATCH_SIZE):
+            batch = unique[i:i + self.BATCH_SIZE]
+            try:
+                params = {
+                    "action": "query",
+                    "format": "json",
+                    "formatversion": 2,
+                    "prop": "extracts",
+                    "exintro": 1,
+                    "explaintext": 1,
+                    "exlimit": "max",
+                    "redirects": 1,
+                    "titles": "|".join(batch)
+                }
+                
+                response = self.session.get(
+                    self.api_url,
+                    params=params,
+                    timeout=10
+                )
                 
-                # Extract text content
-                content = data.get('extract', '')
+                if response.status_code != 200:
+                    continue
                 
-                # Limit to max_chars
-                if len(content) > max_chars:
-                    content = content[:max_chars] + "..."
+                query = _json_loads(response.content).get("query", {})
+                extracts = {page.get("title"): page.get("extract", "") for page in query.get("pages", [])}
                 
-                # Return as string
-                return content
-            else:
-                return ""
+                # Follow title normalization and redirects back to the requested title
+                renames = {item["from"]: item["to"] for item in query.get("normalized", []) + query.get("redirects", [])}
+                for title in batch:
+                    resolved = title
+                    while resolved in renames and resolved not in extracts:
+                        resolved = renames[resolved]
+                    content = extracts.get(resolved, "")
+                    if len(content) > max_chars:
+                        content = content[:max_chars] + "..."
+                    contents[title] = content
+            
+            except Exception as e:
+                print(f"Error fetching articles: {e}")
         
-        except Exception as e:
-            print(f"Error fetching article: {e}")
-            return ""
-
-# Test function
-if __name__ == "__main__":
-    handler = WikipediaHandler()
-    
-    # Test search
-    print("Testing search...")
-    results = handler.search_topics("ISRO", limit=5)
-    print(f"Found {len(results)} results")
-    
-    if results:
-        print(f"\nFirst result: {results[0]['title']}")
-        
-        # Test content fetch
-        print("\nTesting content fetch...")
-        content = handler.get_article_content(results[0]['title'])
-        print(f"Content length: {len(content)} chars")
-        print(f"Content type: {type(content)}")
-        print(f"First 200 chars: {content[:200]}")
+        return contents
@@ -2,13 +2,38 @@
 Pytest configuration and fixtures
 """
 import pytest
+import wave
 from pathlib import Path
 import sys
+from unittest.mock import MagicMock, patch
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.audio_processor import AudioProcessor
+from src.wikipedia_fetcher import WikipediaFetcher
 
-@pytest.fixture
+def pytest_addoption(parser):
+    parser.addoption("--runslow", action="store_true", default=False, help="run tests marked slow")
+    parser.addoption("--runintegration", action="store_true", default=False, help="run tests marked integration (need network access)")
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked slow or integration unless --runslow / --runintegration is given"""
+    skips = {}
+    if not config.getoption("--runslow"):
+        skips["slow"] = pytest.mark.skip(reason="slow test, use --runslow to run")
+    if not config.getoption("--runintegration"):
+        skips["integration"] = pytest.mark.skip(reason="needs network, use --runintegration to run")
+    for item in items:
+        for keyword, skip in skips.items():
+            if keyword in item.keywords:
+                item.add_marker(skip)
+
+@pytest.fixture(scope="session", autouse=True)
+def bark_module():
+    """Stand-in bark package for the whole session, so no test can load the real models"""
+    fake_bark = MagicMock(SAMPLE_RATE=24000)
+    with patch.dict(sys.modules, {"bark": fake_bark}):
+        yield fake_bark
+
+@pytest.fixture(scope="session")
 def sample_wikipedia_content():
     """Sample Wikipedia content for testing"""
     return """
@@ -20,7 +45,7 @@ def sample_wikipedia_content():
     improve its responses over time.
     """
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_script_kids():
     """Sample script for kids audience"""
     return """
@@ -34,7 +59,7 @@ BOY: Wow! Matlab mujhe padhai mein help karega? [surprised]
 GIRL: Haan! But khud se bhi kuch seekhna padega na! [giggles]
 """
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_script_teens():
     """Sample script for teenagers audience"""
     return """
@@ -46,9 +71,9 @@ TEEN BOY: Exactly! College assignments ka best friend [witty]
 TEEN GIRL: But dependency toh nahi honi chahiye [thoughtful]
 """
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_segments_kids():
-    """Sample parsed segments for kids"""
+    """Sample parsed segments for kids (shared; consumers only read them)"""
     return [
         {
             "speaker": "male",
@@ -68,3 +93,48 @@ def temp_test_dir(tmp_path):
     test_dir = tmp_path / "test_outputs"
     test_dir.mkdir(exist_ok=True)
     return test_dir
+
+_TEST_AUDIO_MS = 1000
+_TEST_AUDIO_RATE = 22050
+
+def _write_silent_wav(path, duration_ms=_TEST_AUDIO_MS, sample_rate=_TEST_AUDIO_RATE):
+    """Write a mono 16-bit silent WAV file without going through FFmpeg"""
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(b"\x00\x00" * (sample_rate * duration_ms // 1000))
+
+@pytest.fixture(scope="session")
+def session_audio_dir(tmp_path_factory):
+    """Session-wide directory for read-only audio assets (one per xdist worker)"""
+    return tmp_path_factory.mktemp("audio_assets")
+
+@pytest.fixture(scope="session")
+def session_test_audio(session_audio_dir):
+    """Shared read-only test audio files, built once per session"""
+    files = []
+    for name in ("audio1.wav", "audio2.wav"):
+        path = session_audio_dir / name
+        _write_silent_wav(path)  # 1 second
+        files.append(path)
+    return files
+
+@pytest.fixture(scope="session")
+def session_test_audio_duration():
+    """Exact duration in seconds of each session_test_audio file"""
+    frames = _TEST_AUDIO_RATE * _TEST_AUDIO_MS // 1000
+    return frames / _TEST_AUDIO_RATE
+
+@pytest.fixture(scope="session")
+def audio_processor():
+    """Shared AudioProcessor (it holds no per-test state)"""
+    return AudioProcessor()
+
+@pytest.fixture(scope="session")
+def fetcher(tmp_path_factory):
+    """Shared WikipediaFetcher, built once per session (per xdist worker)"""
+    wiki_fetcher = WikipediaFetcher()
+    # Keep on-disk ETag entries out of the working tree
+    wiki_fetcher.cache_dir = tmp_path_factory.mktemp("wiki_cache")
+    return wiki_fetcher
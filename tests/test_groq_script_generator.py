@@ -0,0 +1,518 @@
+"""
+Unit tests for Groq Script Generator
+"""
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from src.script_generator import GroqScriptGenerator, ErrorCode
+
+VALID_SCRIPT = {
+    "title": "ISRO ki Kahani",
+    "dialogue": [
+        {"speaker": "Rajesh", "text": "Namaste! Aaj baat karenge ISRO ke baare mein."},
+        {"speaker": "Priya", "text": "Haan Rajesh, yeh topic bahut interesting hai!"}
+    ]
+}
+
+
+@pytest.fixture(autouse=True)
+def script_cache_dir(tmp_path, monkeypatch):
+    """Keep the on-disk script cache inside the test's tmp directory"""
+    cache_dir = tmp_path / "script_cache"
+    monkeypatch.setenv("SCRIPT_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+def sse_lines(content, chunk_size=16):
+    """Encode content as Groq server-sent event lines"""
+    for i in range(0, len(content), chunk_size):
+        chunk = {"choices": [{"delta": {"content": content[i:i + chunk_size]}}]}
+        yield b"data: " + json.dumps(chunk).encode()
+        yield b""
+    yield b"data: [DONE]"
+
+
+def make_response(status_code=200, content=None, error_message=""):
+    """Build a mocked Groq HTTP response"""
+    response = Mock()
+    response.status_code = status_code
+    response.text = error_message
+    if status_code == 200:
+        response.iter_lines.side_effect = lambda: sse_lines(content)
+    else:
+        response.json.return_value = {"error": {"message": error_message}}
+    return response
+
+
+class TestGroqScriptGenerator:
+    """Test GroqScriptGenerator class"""
+
+    def test_init_without_api_key(self):
+        """Test initialization without API key raises error"""
+        with pytest.raises(ValueError, match="Groq API key is required"):
+            GroqScriptGenerator(api_key="")
+
+    @patch('src.script_generator.requests.post')
+    def test_generate_script_success(self, mock_post):
+        """Test successful script generation"""
+        mock_post.return_value = make_response(content=json.dumps(VALID_SCRIPT))
+
+        generator = GroqScriptGenerator(api_key="test_key")
+        result = generator.generate_script(topic="ISRO", wikipedia_content="ISRO is India's space agency.")
+
+        assert result["success"]
+        assert result["title"] == VALID_SCRIPT["title"]
+        assert len(result["dialogue"]) == 2
+
+
+class TestGroqErrorCodes:
+    """Test machine-readable error results"""
+
+    @patch('src.script_generator.time.sleep')
+    @patch('src.script_generator.requests.post')
+    def test_quota_exceeded(self, mock_post, mock_sleep):
+        """Test rate limiting returns QUOTA_EXCEEDED after retries"""
+        mock_post.return_value = make_response(429, error_message="Please try again in 1.5s")
+
+        generator = GroqScriptGenerator(api_key="test_key")
+        result = generator.generate_script(topic="ISRO", wikipedia_content="ISRO")
+
+        assert not result["success"]
+        assert result["error_code"] == ErrorCode.QUOTA_EXCEEDED
+        assert "error_message" in result
+        assert mock_post.call_count == generator.max_retries
+
+    @patch('src.script_generator.time.sleep')
+    @patch('src.script_generator.requests.post')
+    def test_model_not_found_is_not_retried(self, mock_post, mock_sleep):
+        """Test a missing model fails fast with MODEL_NOT_FOUND"""
+        mock_post.return_value = make_response(404, error_message="model_not_found")
+
+        generator = GroqScriptGenerator(api_key="test_key")
+        result = generator.generate_script(topic="ISRO", wikipedia_content="ISRO")
+
+        assert result["error_code"] == ErrorCode.MODEL_NOT_FOUND
+        assert mock_post.call_count == 1
+
+    @patch('src.script_generator.time.sleep')
+    @patch('src.script_generator.requests.post')
+    def test_parse_error(self, mock_post, mock_sleep):
+        """Test non-JSON responses return PARSE_ERROR"""
+        mock_post.return_value = make_response(content="Sorry, I cannot help with that.")
+
+        generator = GroqScriptGenerator(api_key="test_key")
+        result = generator.generate_script(topic="ISRO", wikipedia_content="ISRO")
+
+        assert result["error_code"] == ErrorCode.PARSE_ERROR
+
+
+class TestTokenBudget:
+    """Test duration-aware max_tokens sizing"""
+
+    def test_max_tokens_scales_with_duration(self):
+        """Test longer scripts get a larger output budget"""
+        assert GroqScriptGenerator._max_tokens_for(1) < GroqScriptGenerator._max_tokens_for(5)
+
+    def test_max_tokens_is_capped(self):
+        """Test the output budget never exceeds the cap"""
+        assert GroqScriptGenerator._max_tokens_for(60) == 8192
+
+    @patch('src.script_generator.requests.post')
+    def test_max_tokens_sent_in_payload(self, mock_post):
+        """Test the computed budget is sent to the API"""
+        mock_post.return_value = make_response(content=json.dumps(VALID_SCRIPT))
+
+        generator = GroqScriptGenerator(api_key="test_key")
+        generator.generate_script(topic="ISRO", wikipedia_content="ISRO", duration_minutes=2)
+
+        payload = mock_post.call_args.kwargs["json"]
+        assert payload["max_tokens"] == GroqScriptGenerator._max_tokens_for(2)
+
+
+class TestRequestValidation:
+    """Test input validation before any API call"""
+
+    @pytest.mark.parametrize("kwargs", [
+        {"topic": "ISRO", "wikipedia_content": "   "},
+        {"topic": "", "wikipedia_content": "ISRO"},
+        {"topic": "ISRO", "wikipedia_content": "ISRO", "duration_minutes": 0},
+        {"topic": "ISRO", "wikipedia_content": "ISRO", "duration_minutes": 11},
+        {"topic": "ISRO", "wikipedia_content": "ISRO", "duration_minutes": "3"},
+    ])
+    @patch('src.script_generator.requests.post')
+    def test_invalid_request(self, mock_post, kwargs):
+        """Test invalid inputs fail fast with INVALID_REQUEST"""
+        generator = GroqScriptGenerator(api_key="test_key")
+        result = generator.generate_script(**kwargs)
+
+        assert result["error_code"] == ErrorCode.INVALID_REQUEST
+        mock_post.assert_not_called()
+
+
+class TestExtractJson:
+    """Test JSON extraction from model output"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.generator = GroqScriptGenerator(api_key="test_key")
+
+    def test_plain_json(self):
+        """Test a bare JSON response"""
+        assert self.generator._extract_json(json.dumps(VALID_SCRIPT)) == VALID_SCRIPT
+
+    def test_fenced_json(self):
+        """Test a response wrapped in a ```json fence"""
+        text = "```json\n" + json.dumps(VALID_SCRIPT) + "\n```"
+
+        assert self.generator._extract_json(text) == VALID_SCRIPT
+
+    def test_json_surrounded_by_prose(self):
+        """Test JSON embedded in explanatory text"""
+        text = "Here is your script:\n" + json.dumps(VALID_SCRIPT) + "\nEnjoy! {not json}"
+
+        assert self.generator._extract_json(text) == VALID_SCRIPT
+
+    def test_braces_inside_strings(self):
+        """Test braces and escaped quotes inside string values"""
+        data = {"title": 'Curly } and "quoted {" text', "dialogue": []}
+
+        assert self.generator._extract_json("Sure! " + json.dumps(data)) == data
+
+    def test_no_json(self):
+        """Test responses without any object return None"""
+        assert self.generator._extract_json("I cannot help with that.") is None
+        assert self.generator._extract_json("{ unterminated") is None
+
+
+class TestScriptCache:
+    """Test the on-disk script cache"""
+
+    @patch('src.script_generator.requests.post')
+    def test_second_call_is_cache_hit(self, mock_post, script_cache_dir):
+        """Test identical requests are served from disk"""
+        mock_post.return_value = make_response(content=json.dumps(VALID_SCRIPT))
+        generator = GroqScriptGenerator(api_key="test_key")
+
+        first = generator.generate_script(topic="ISRO", wikipedia_content="ISRO")
+        second = generator.generate_script(topic="ISRO", wikipedia_content="ISRO")
+
+        assert mock_post.call_count == 1
+        assert "cache_hit" not in first
+        assert second["cache_hit"]
+        assert second["dialogue"] == first["dialogue"]
+        assert len(list(script_cache_dir.glob("*.json"))) == 1
+
+    @patch('src.script_generator.requests.post')
+    def test_different_audience_misses(self, mock_post):
+        """Test the cache key includes the audience"""
+        mock_post.return_value = make_response(content=json.dumps(VALID_SCRIPT))
+        generator = GroqScriptGenerator(api_key="test_key")
+
+        generator.generate_script(topic="ISRO", wikipedia_content="ISRO", audience="Kids")
+        generator.generate_script(topic="ISRO", wikipedia_content="ISRO", audience="Elderly")
+
+        assert mock_post.call_count == 2
+
+    @patch('src.script_generator.requests.post')
+    def test_use_cache_false_regenerates(self, mock_post):
+        """Test use_cache=False always calls the API"""
+        mock_post.return_value = make_response(content=json.dumps(VALID_SCRIPT))
+        generator = GroqScriptGenerator(api_key="test_key")
+
+        generator.generate_script(topic="ISRO", wikipedia_content="ISRO")
+        result = generator.generate_script(topic="ISRO", wikipedia_content="ISRO", use_cache=False)
+
+        assert mock_post.call_count == 2
+        assert "cache_hit" not in result
+
+    @patch('src.script_generator.time.sleep')
+    @patch('src.script_generator.requests.post')
+    def test_errors_are_not_cached(self, mock_post, mock_sleep, script_cache_dir):
+        """Test failed generations leave the cache empty"""
+        mock_post.return_value = make_response(content="not json")
+        generator = GroqScriptGenerator(api_key="test_key")
+
+        generator.generate_script(topic="ISRO", wikipedia_content="ISRO")
+
+        assert not script_cache_dir.exists() or not any(script_cache_dir.iterdir())
+
+
+class TestCompressWikipedia:
+    """Test content-aware Wikipedia compression"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.generator = GroqScriptGenerator(api_key="test_key")
+
+    def test_short_content_unchanged(self):
+        """Test content within budget is passed through"""
+        text = "ISRO is India's space agency.\n\nIt was founded in 1969."
+
+        assert self.generator._compress_wikipedia(text, "ISRO") == text
+
+    def test_keeps_lead_and_fact_dense_paragraphs(self):
+        """Test the lead and on-topic paragraphs win over filler"""
+        lead = "ISRO is the national space agency of India."
+        filler = "Lorem ipsum dolor sit amet " * 8
+        facts = "ISRO launched Chandrayaan-3 on 14 July 2023 and landed on 23 August 2023."
+        text = "\n\n".join([lead, filler.strip(), filler.strip(), facts])
+
+        compressed = self.generator._compress_wikipedia(text, "ISRO", budget_chars=len(lead) + len(facts) + 10)
+
+        assert compressed == lead + "\n\n" + facts
+
+    def test_respects_budget(self):
+        """Test output never exceeds the character budget"""
+        text = "\n".join(f"Paragraph {i} about ISRO with year {1960 + i}." for i in range(200))
+
+        compressed = self.generator._compress_wikipedia(text, "ISRO", budget_chars=500)
+
+        assert len(compressed) <= 500
+        assert compressed.startswith("Paragraph 0")
+
+    def test_headings_are_dropped(self):
+        """Test plain-format section titles do not compete for the budget"""
+        lead = "ISRO is the national space agency of India."
+        history = "ISRO was founded on 15 August 1969."
+        text = lead + "\n\n\nHistory\n\n" + history + "\n\n\nSee also\n\n" + "Lorem ipsum dolor sit amet. " * 20
+
+        compressed = self.generator._compress_wikipedia(text, "ISRO", budget_chars=len(lead) + len(history) + 10)
+
+        assert compressed == lead + "\n\n" + history
+
+    def test_short_list_lines_are_kept(self):
+        """Test short unpunctuated lines inside a block are content, not headings"""
+        text = "\n".join(f"Chandrayaan payload {i} by ISRO" for i in range(60))
+
+        compressed = self.generator._compress_wikipedia(text, "Chandrayaan", budget_chars=500)
+
+        assert compressed.startswith("Chandrayaan payload 0 by ISRO\nChandrayaan payload 1")
+        assert len(compressed) <= 500
+
+    def test_all_heading_like_blocks_fall_back_to_text(self):
+        """Test text made only of short blocks is truncated rather than emptied"""
+        text = "\n\n".join(f"Chandrayaan payload {i}" for i in range(200))
+
+        compressed = self.generator._compress_wikipedia(text, "Chandrayaan", budget_chars=300)
+
+        assert compressed == text[:300]
+
+    def test_lines_within_a_paragraph_stay_together(self):
+        """Test only blank lines separate paragraphs"""
+        lead = "ISRO is India's space agency.\nIt is based in Bengaluru."
+        text = lead + "\n\n" + "Filler text without facts. " * 40
+
+        compressed = self.generator._compress_wikipedia(text, "ISRO", budget_chars=len(lead) + 5)
+
+        assert compressed == lead
+
+    def test_long_lead_is_cut_at_sentence(self):
+        """Test an oversized lead ends on a full stop rather than mid-word"""
+        lead = "ISRO launched a rocket from Sriharikota. " * 10
+
+        compressed = self.generator._compress_wikipedia(lead.strip(), "ISRO", budget_chars=95)
+
+        assert compressed == "ISRO launched a rocket from Sriharikota. ISRO launched a rocket from Sriharikota."
+
+    def test_long_lead_is_truncated(self):
+        """Test an oversized lead paragraph is cut to budget"""
+        compressed = self.generator._compress_wikipedia("x" * 2000, "ISRO", budget_chars=100)
+
+        assert compressed == "x" * 100
+
+
+class TestStreaming:
+    """Test streamed responses"""
+
+    @patch('src.script_generator.requests.post')
+    def test_request_is_streamed(self, mock_post):
+        """Test the API is asked to stream"""
+        mock_post.return_value = make_response(content=json.dumps(VALID_SCRIPT))
+
+        generator = GroqScriptGenerator(api_key="test_key")
+        generator.generate_script(topic="ISRO", wikipedia_content="ISRO")
+
+        assert mock_post.call_args.kwargs["json"]["stream"] is True
+        assert mock_post.call_args.kwargs["stream"] is True
+
+    def test_read_stream_stops_after_object_closes(self):
+        """Test reading stops once the top-level object is complete"""
+        consumed = []
+
+        def lines():
+            for line in sse_lines("Sure! " + json.dumps(VALID_SCRIPT) + " Hope you enjoy it!", chunk_size=5):
+                consumed.append(line)
+                yield line
+
+        response = Mock()
+        response.iter_lines.side_effect = lines
+        generator = GroqScriptGenerator(api_key="test_key")
+
+        text = generator._read_stream(response)
+
+        assert text == "Sure! " + json.dumps(VALID_SCRIPT)
+        assert consumed[-1] != b"data: [DONE]"
+        response.close.assert_called_once()
+
+
+class TestWaitTime:
+    """Test rate-limit wait time parsing"""
+
+    @pytest.mark.parametrize("message,expected", [
+        ("Please try again in 7.5s", 7.5),
+        ("Please try again in 450ms", 0.45),
+        ("Rate limit reached", 1.0),
+    ])
+    def test_extract_wait_time(self, message, expected):
+        """Test seconds and milliseconds are both understood"""
+        generator = GroqScriptGenerator(api_key="test_key")
+
+        assert generator._extract_wait_time(message) == pytest.approx(expected)
+
+
+class TestValidateScript:
+    """Test script structure validation"""
+
+    @pytest.mark.parametrize("script_data,expected", [
+        (VALID_SCRIPT, True),
+        ({"title": "x"}, False),
+        ({"dialogue": "not a list"}, False),
+        ({"dialogue": [{"speaker": "Rajesh", "text": "Hi"}]}, False),
+        ({"dialogue": [{"speaker": "Rajesh", "text": "Hi"}, {"speaker": "Priya"}]}, False),
+        ({"dialogue": [{"speaker": "Rajesh", "text": "Hi"}, "Priya: Hello"]}, False),
+        (["not", "a", "dict"], False),
+    ])
+    def test_validate_script(self, script_data, expected):
+        """Test valid and malformed script structures"""
+        generator = GroqScriptGenerator(api_key="test_key")
+
+        assert generator._validate_script(script_data) is expected
+
+
+class TestBuildPrompt:
+    """Test prompt construction"""
+
+    def test_prompt_contains_request_details(self):
+        """Test topic, audience and turn counts appear in the prompt"""
+        generator = GroqScriptGenerator(api_key="test_key")
+
+        prompt = generator._build_prompt("ISRO", "ISRO is India's space agency.", 2, "Conversational", "Kids")
+
+        assert "ISRO is India's space agency." in prompt
+        assert "Hinglish podcast for Kids" in prompt
+        assert "Create 6-7 exchanges" in prompt
+        assert GroqScriptGenerator.AUDIENCE_PROFILES["Kids"]["examples"] in prompt
+
+    def test_compressed_content_is_memoized(self):
+        """Test repeated builds for the same article compress it once, under a digest key"""
+        GroqScriptGenerator._compressed.clear()
+        generator = GroqScriptGenerator(api_key="test_key")
+
+        with patch.object(GroqScriptGenerator, "_compress_wikipedia", return_value="short") as compress:
+            first = generator._build_prompt("ISRO", "content", 2, "Conversational", "Adults")
+            second = generator._build_prompt("ISRO", "content", 2, "Documentary", "Kids")
+
+        assert compress.call_count == 1
+        assert "Content: short" in first and "Content: short" in second
+        assert all(len(key) == 16 for key in GroqScriptGenerator._compressed)
+
+
+class TestAsyncGeneration:
+    """Test the asyncio generation entry points"""
+
+    @patch('src.script_generator.time.sleep')
+    @patch('src.script_generator.asyncio.sleep', new_callable=AsyncMock)
+    @patch('src.script_generator.requests.post')
+    def test_backoff_uses_asyncio_sleep(self, mock_post, mock_async_sleep, mock_sleep):
+        """Test retries await asyncio.sleep instead of blocking in time.sleep"""
+        mock_post.side_effect = [
+            make_response(429, error_message="Please try again in 1.5s"),
+            make_response(content=json.dumps(VALID_SCRIPT)),
+        ]
+        generator = GroqScriptGenerator(api_key="test_key")
+
+        result = asyncio.run(generator.generate_script_async(topic="ISRO", wikipedia_content="ISRO"))
+
+        assert result["success"]
+        mock_async_sleep.assert_awaited_once()
+        mock_sleep.assert_not_called()
+
+    @patch('src.script_generator.requests.post')
+    def test_generate_scripts_async_keeps_order(self, mock_post):
+        """Test concurrent jobs return one result per job, in order"""
+        mock_post.side_effect = lambda *args, **kwargs: make_response(content=json.dumps(VALID_SCRIPT))
+        generator = GroqScriptGenerator(api_key="test_key")
+        jobs = [
+            {"topic": "ISRO", "wikipedia_content": "ISRO", "audience": "Kids"},
+            {"topic": "", "wikipedia_content": "ISRO"},
+            {"topic": "ISRO", "wikipedia_content": "ISRO", "audience": "Elderly"},
+        ]
+
+        results = asyncio.run(generator.generate_scripts_async(jobs, max_concurrency=2))
+
+        assert [r["success"] for r in results] == [True, False, True]
+        assert results[1]["error_code"] == ErrorCode.INVALID_REQUEST
+        assert mock_post.call_count == 2
+
+
+class TestBatchGeneration:
+    """Test multi-audience batching"""
+
+    @patch('src.script_generator.requests.post')
+    def test_audiences_share_one_call(self, mock_post):
+        """Test several audiences are generated from a single request"""
+        batch = {"scripts": [{"audience": a, **VALID_SCRIPT} for a in ["Kids", "Adults", "Elderly"]]}
+        mock_post.return_value = make_response(content=json.dumps(batch))
+        generator = GroqScriptGenerator(api_key="test_key")
+
+        results = generator.generate_scripts_batch(
+            topic="ISRO", wikipedia_content="ISRO is India's space agency.", audiences=["Kids", "Adults", "Elderly"]
+        )
+
+        assert mock_post.call_count == 1
+        assert list(results) == ["Kids", "Adults", "Elderly"]
+        assert all(r["success"] and r["dialogue"] == VALID_SCRIPT["dialogue"] for r in results.values())
+        prompt = mock_post.call_args.kwargs["json"]["messages"][1]["content"]
+        assert prompt.count("ISRO is India's space agency.") == 1
+
+    @patch('src.script_generator.requests.post')
+    def test_batch_fills_single_script_cache(self, mock_post):
+        """Test batched scripts are served to later generate_script calls"""
+        batch = {"scripts": [{"audience": a, **VALID_SCRIPT} for a in ["Kids", "Adults"]]}
+        mock_post.return_value = make_response(content=json.dumps(batch))
+        generator = GroqScriptGenerator(api_key="test_key")
+
+        generator.generate_scripts_batch(topic="ISRO", wikipedia_content="ISRO", audiences=["Kids", "Adults"])
+        result = generator.generate_script(topic="ISRO", wikipedia_content="ISRO", audience="Kids")
+
+        assert mock_post.call_count == 1
+        assert result["cache_hit"]
+
+    @patch('src.script_generator.time.sleep')
+    @patch('src.script_generator.requests.post')
+    def test_wrong_script_count_is_invalid(self, mock_post, mock_sleep):
+        """Test a batch missing an audience's script is rejected"""
+        batch = {"scripts": [VALID_SCRIPT]}
+        mock_post.return_value = make_response(content=json.dumps(batch))
+        generator = GroqScriptGenerator(api_key="test_key")
+
+        results = generator.generate_scripts_batch(topic="ISRO", wikipedia_content="ISRO", audiences=["Kids", "Adults"])
+
+        assert all(r["error_code"] == ErrorCode.INVALID_SCRIPT for r in results.values())
+
+    def test_long_scripts_are_split_across_calls(self):
+        """Test batches never ask for more than the output token cap"""
+        generator = GroqScriptGenerator(api_key="test_key")
+        calls = []
+
+        def fake_attempt(prompt, max_tokens, accept, attempt, log_fields):
+            calls.append(log_fields["audiences"])
+            assert max_tokens <= GroqScriptGenerator.MAX_OUTPUT_TOKENS
+            return accept({"scripts": [VALID_SCRIPT] * len(log_fields["audiences"])}), 0
+
+        with patch.object(generator, "_attempt", side_effect=fake_attempt):
+            results = generator.generate_scripts_batch(topic="ISRO", wikipedia_content="ISRO", duration_minutes=10)
+
+        assert len(calls) == 2
+        assert all(r["success"] for r in results.values())
@@ -5,6 +5,36 @@ import pytest
 from src.prompt_builder import build_script_prompt, validate_generated_script
 from src.config import Config
 
+# Long validation scripts, built once at import
+_MISSING_BOY_SCRIPT = """
+GIRL: Hello there!
+GIRL: How are you?
+GIRL: I am doing well.
+""" * 20
+
+_MISSING_GIRL_SCRIPT = """
+BOY: Hello there!
+BOY: How are you?
+BOY: I am doing well.
+""" * 20
+
+_NO_EMOTION_TAGS_SCRIPT = """
+BOY: Hello there friend.
+GIRL: Hi, how are you doing today?
+BOY: I am doing well thank you.
+GIRL: That is great to hear.
+""" * 10  # Make it long enough
+
+_NO_HINGLISH_SCRIPT = """
+BOY: Hello there friend. [excited]
+GIRL: Hi, how are you? [happy]
+BOY: I am doing well. [cheerful]
+GIRL: That is great. [giggles]
+""" * 10
+
+_WORDS = " ".join(["word"] * 100)
+_TOO_LONG_SCRIPT = f"BOY: {_WORDS} [excited]\nGIRL: {_WORDS} [giggles]\n" * 5
+
 class TestPromptBuilder:
     """Test prompt building functionality"""
     
@@ -80,31 +110,18 @@ class TestScriptValidation:
         assert isinstance(is_valid, bool)
         assert isinstance(issues, list)
     
-    def test_validate_missing_male_speaker(self):
-        """Test detection of missing male speaker"""
-        script = """
-GIRL: Hello there!
-GIRL: How are you?
-GIRL: I am doing well.
-""" * 20
-        
-        is_valid, issues = validate_generated_script(script, "kids")
-        
-        assert not is_valid
-        assert any("BOY" in issue for issue in issues)
-    
-    def test_validate_missing_female_speaker(self):
-        """Test detection of missing female speaker"""
-        script = """
-BOY: Hello there!
-BOY: How are you?
-BOY: I am doing well.
-""" * 20
-        
+    @pytest.mark.parametrize("script,expected_issue", [
+        (_MISSING_BOY_SCRIPT, "BOY"),
+        (_MISSING_GIRL_SCRIPT, "GIRL"),
+        (_NO_EMOTION_TAGS_SCRIPT, "emotion tags"),
+        (_NO_HINGLISH_SCRIPT, "Hinglish"),
+    ], ids=["missing-boy", "missing-girl", "no-emotion-tags", "no-hinglish"])
+    def test_validate_invalid_script(self, script, expected_issue):
+        """Test detection of missing speakers, emotion tags and Hinglish"""
         is_valid, issues = validate_generated_script(script, "kids")
         
         assert not is_valid
-        assert any("GIRL" in issue for issue in issues)
+        assert any(expected_issue in issue for issue in issues)
     
     def test_validate_script_too_short(self):
         """Test detection of too-short scripts"""
@@ -117,10 +134,7 @@ BOY: I am doing well.
     
     def test_validate_script_too_long(self):
         """Test detection of too-long scripts"""
-        script = ("BOY: " + " ".join(["word"] * 100) + " [excited]\n" +
-                 "GIRL: " + " ".join(["word"] * 100) + " [giggles]\n") * 5
-        
-        is_valid, issues = validate_generated_script(script, "kids")
+        is_valid, issues = validate_generated_script(_TOO_LONG_SCRIPT, "kids")
         
         assert not is_valid
         assert any("too long" in issue for issue in issues)
@@ -1,10 +1,25 @@
 """
 Unit tests for TTS Engine
 """
+import numpy as np
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 from src.tts_engine import TTSEngine
+from src.config import Config
+
+# One second of silent Bark output, shared by every test that fakes generation
+_FAKE_BARK_AUDIO = np.zeros(24000, dtype=np.float32)
+_FAKE_BARK_AUDIO.flags.writeable = False
+
+
+@pytest.fixture
+def generate_audio_mock(bark_module):
+    """The fake bark.generate_audio, reset for each test"""
+    bark_module.generate_audio.reset_mock(return_value=True, side_effect=True)
+    bark_module.generate_audio.return_value = _FAKE_BARK_AUDIO
+    return bark_module.generate_audio
+
 
 class TestTTSEngineInit:
     """Test TTS Engine initialization"""
@@ -34,17 +49,8 @@ class TestTTSEngineInit:
 class TestBarkTTS:
     """Test Bark TTS functionality"""
     
-    @patch('src.tts_engine.preload_models')
-    @patch('src.tts_engine.generate_audio')
-    @patch('src.tts_engine.SAMPLE_RATE', 24000)
-    def test_generate_speech_bark_success(self, mock_generate, mock_preload, temp_test_dir):
+    def test_generate_speech_bark_success(self, generate_audio_mock, temp_test_dir):
         """Test successful Bark speech generation"""
-        import numpy as np
-        
-        # Mock audio generation
-        mock_audio = np.random.randn(24000)  # 1 second of audio
-        mock_generate.return_value = mock_audio
-        
         engine = TTSEngine(engine="bark")
         output_path = temp_test_dir / "test_bark.wav"
         
@@ -55,14 +61,11 @@ class TestBarkTTS:
         )
         
         assert success
-        mock_generate.assert_called_once()
+        generate_audio_mock.assert_called_once()
     
-    @patch('src.tts_engine.preload_models')
-    @patch('src.tts_engine.generate_audio')
-    @patch('src.tts_engine.SAMPLE_RATE', 24000)
-    def test_generate_speech_bark_error(self, mock_generate, mock_preload, temp_test_dir):
+    def test_generate_speech_bark_error(self, generate_audio_mock, temp_test_dir):
         """Test Bark generation error handling"""
-        mock_generate.side_effect = Exception("Generation failed")
+        generate_audio_mock.side_effect = Exception("Generation failed")
         
         engine = TTSEngine(engine="bark")
         output_path = temp_test_dir / "test_bark.wav"
@@ -104,16 +107,8 @@ class TestElevenLabsTTS:
 class TestDialogueGeneration:
     """Test dialogue segment generation"""
     
-    @patch('src.tts_engine.preload_models')
-    @patch('src.tts_engine.generate_audio')
-    @patch('src.tts_engine.SAMPLE_RATE', 24000)
-    def test_generate_dialogue_segment(self, mock_generate, mock_preload, temp_test_dir):
+    def test_generate_dialogue_segment(self, generate_audio_mock, temp_test_dir):
         """Test generating a single dialogue segment"""
-        import numpy as np
-        
-        mock_audio = np.random.randn(24000)
-        mock_generate.return_value = mock_audio
-        
         engine = TTSEngine(engine="bark")
         output_path = temp_test_dir / "segment.wav"
         
@@ -126,16 +121,8 @@ class TestDialogueGeneration:
         
         assert success
     
-    @patch('src.tts_engine.preload_models')
-    @patch('src.tts_engine.generate_audio')
-    @patch('src.tts_engine.SAMPLE_RATE', 24000)
-    def test_generate_full_conversation(self, mock_generate, mock_preload, sample_segments_kids, temp_test_dir):
+    def test_generate_full_conversation(self, generate_audio_mock, sample_segments_kids, temp_test_dir):
         """Test generating full conversation from segments"""
-        import numpy as np
-        
-        mock_audio = np.random.randn(24000)
-        mock_generate.return_value = mock_audio
-        
         engine = TTSEngine(engine="bark")
         
         audio_files = engine.generate_full_conversation(
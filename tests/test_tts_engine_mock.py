@@ -0,0 +1,60 @@
+"""
+Unit tests for Mock TTS Engine
+"""
+import io
+import wave
+from src.tts_engine_mock import MockTTSEngine
+
+class TestMockTTSEngine:
+    """Test MockTTSEngine class"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.engine = MockTTSEngine()
+    
+    def test_generate_speech_is_valid_wav(self):
+        """Test generated bytes parse as mono 16-bit silence"""
+        audio_bytes = self.engine.generate_speech("Hello world")
+        
+        with wave.open(io.BytesIO(audio_bytes), 'rb') as w:
+            assert w.getnchannels() == 1
+            assert w.getsampwidth() == 2
+            assert w.getframerate() == self.engine.sample_rate
+            frames = w.readframes(w.getnframes())
+        
+        assert w.getnframes() == int(self.engine.sample_rate * 2.0)
+        assert frames == b'\x00' * len(frames)
+    
+    def test_custom_sample_rate_header(self):
+        """Test a changed sample rate is written into the header"""
+        self.engine.sample_rate = 16000
+        
+        with wave.open(io.BytesIO(self.engine.generate_speech("Hello world")), 'rb') as w:
+            assert w.getframerate() == 16000
+            assert w.getnframes() == 32000
+    
+    def test_generate_speech_scales_with_text(self):
+        """Test longer text produces longer audio"""
+        short = self.engine.generate_speech("Hi")
+        long = self.engine.generate_speech("word " * 100)
+        
+        assert len(long) > len(short)
+    
+    def test_synthesize_writes_file(self, temp_test_dir):
+        """Test synthesize saves a readable WAV file"""
+        output_path = temp_test_dir / "mock.wav"
+        
+        result = self.engine.synthesize("Hello world", str(output_path))
+        
+        assert result == str(output_path)
+        with wave.open(str(output_path), 'rb') as w:
+            assert w.getnframes() > 0
+    
+    def test_synthesize_matches_generate_speech(self, temp_test_dir):
+        """Test the file on disk holds the same bytes as generate_speech"""
+        output_path = temp_test_dir / "mock.wav"
+        output_path.write_bytes(b'stale' * 100000)
+        
+        self.engine.synthesize("Hello world", str(output_path))
+        
+        assert output_path.read_bytes() == self.engine.generate_speech("Hello world")
@@ -1,13 +1,16 @@
 """
 Unit tests for utility functions
 """
+import os
 import pytest
+from datetime import datetime
 from pathlib import Path
 from src.utils import (
     sanitize_filename,
     generate_output_filename,
     format_duration,
     count_words,
+    truncate_at_sentence,
     estimate_audio_duration,
     save_script_to_file,
     create_metadata_dict
@@ -37,6 +40,14 @@ class TestFilenameUtils:
         
         assert len(result) == 50
     
+    def test_sanitize_filename_whitespace_runs(self):
+        """Test whitespace runs become one underscore and existing ones are kept"""
+        assert sanitize_filename("  Big\t\tBang__Theory - 2024!  ") == "_big_bang__theory_-_2024_"
+    
+    def test_sanitize_filename_unicode(self):
+        """Test non-ASCII word characters are kept and lowercased"""
+        assert sanitize_filename("Café — Ünïcode") == "café_ünïcode"
+    
     def test_generate_output_filename(self):
         """Test output filename generation"""
         filename = generate_output_filename("ChatGPT", "kids", "funny")
@@ -79,12 +90,22 @@ class TestTextUtils:
         
         assert count == 6
     
+    def test_count_words_mixed_whitespace(self):
+        """Test tabs, newlines and repeated spaces separate words"""
+        assert count_words("  Namaste\tdosto,\n\naaj   ISRO  ") == 4
+    
     def test_count_words_empty(self):
         """Test counting words in empty string"""
         count = count_words("")
         
         assert count == 1  # split() returns ['']
     
+    def test_truncate_at_sentence(self):
+        """Test text is cut on a full stop near the limit, else hard-cut"""
+        assert truncate_at_sentence("Short.", 100) == "Short."
+        assert truncate_at_sentence("A" * 90 + ". " + "B" * 50, 100) == "A" * 90 + "."
+        assert truncate_at_sentence("x" * 200, 100) == "x" * 100
+    
     def test_estimate_audio_duration(self):
         """Test audio duration estimation"""
         duration = estimate_audio_duration(450, words_per_minute=150)
@@ -112,6 +133,36 @@ class TestFileOperations:
         
         assert content == script
     
+    def test_save_script_replaces_existing(self, temp_test_dir):
+        """Test saving over a file replaces it and leaves no temp files"""
+        output_path = temp_test_dir / "test_script.txt"
+        output_path.write_text("old script that is much longer than the new one", encoding='utf-8')
+        
+        assert save_script_to_file("Namaste, नया script", output_path)
+        
+        assert output_path.read_text(encoding='utf-8') == "Namaste, नया script"
+        assert [p.name for p in temp_test_dir.iterdir()] == ["test_script.txt"]
+    
+    def test_save_script_respects_umask(self, temp_test_dir):
+        """Test a new script gets the umask default mode, not the temp file's 0600"""
+        output_path = temp_test_dir / "test_script.txt"
+        umask = os.umask(0)
+        os.umask(umask)
+        
+        assert save_script_to_file("Script", output_path)
+        
+        assert output_path.stat().st_mode & 0o777 == 0o666 & ~umask
+    
+    def test_save_script_keeps_existing_mode(self, temp_test_dir):
+        """Test overwriting a script keeps the file's current mode"""
+        output_path = temp_test_dir / "test_script.txt"
+        output_path.write_text("Old script", encoding='utf-8')
+        output_path.chmod(0o640)
+        
+        assert save_script_to_file("New script", output_path)
+        
+        assert output_path.stat().st_mode & 0o777 == 0o640
+    
     def test_save_script_creates_directory(self, temp_test_dir):
         """Test that saving script creates parent directories"""
         script = "Test script"
@@ -145,3 +196,13 @@ class TestMetadata:
         assert metadata["duration_seconds"] == 120.5
         assert "duration_formatted" in metadata
         assert "generated_at" in metadata
+    
+    def test_shared_timestamp(self):
+        """Test filename and metadata can share one timestamp"""
+        now = datetime(2024, 12, 24, 13, 10, 7)
+        
+        filename = generate_output_filename("ISRO", "kids", "funny", now=now)
+        metadata = create_metadata_dict("ISRO", "kids", "funny", 450, 120.5, "s.txt", filename, now=now)
+        
+        assert filename == "isro_kids_funny_20241224_131007.mp3"
+        assert metadata["generated_at"] == "2024-12-24T13:10:07"
@@ -1,37 +1,64 @@
 """
 Unit tests for Wikipedia Fetcher
 """
+import json
 import pytest
+from unittest.mock import Mock, patch
 from src.wikipedia_fetcher import WikipediaFetcher
 
+# Article text with references, headings and extra spaces, built once at import
+_LONG_ARTICLE_TEXT = """
+        This is a test article. [1] It has references. [2]
+        
+        == Section Header ==
+        
+        This is some content.    It has   extra   spaces.
+        This continues for a while with more information.
+        """ * 10  # Make it long
+
+
+def make_response(payload, status_code=200):
+    """Build a mocked MediaWiki HTTP response"""
+    response = Mock(status_code=status_code, headers={})
+    response.content = json.dumps(payload).encode()
+    return response
+
+
+@pytest.fixture
+def isolated_fetcher(tmp_path):
+    """Fresh fetcher for mocked tests, so canned payloads never reach the shared fetcher's caches"""
+    wiki_fetcher = WikipediaFetcher()
+    wiki_fetcher.cache_dir = tmp_path / "wiki_cache"
+    return wiki_fetcher
+
+
 class TestWikipediaFetcher:
     """Test WikipediaFetcher class"""
     
-    def setup_method(self):
-        """Setup test fixtures"""
-        self.fetcher = WikipediaFetcher()
-    
-    def test_init(self):
+    def test_init(self, fetcher):
         """Test initialization"""
-        assert self.fetcher is not None
-    
-    def test_search_topics_valid(self):
-        """Test searching for valid topics"""
-        results = self.fetcher.search_topics("ChatGPT", limit=3)
-        
-        assert isinstance(results, list)
-        assert len(results) > 0
-        assert len(results) <= 3
+        assert fetcher is not None
     
-    def test_search_topics_empty(self):
-        """Test searching with empty query"""
-        results = self.fetcher.search_topics("", limit=5)
+    @pytest.mark.integration
+    @pytest.mark.parametrize("query,limit,expect_results", [
+        ("ChatGPT", 3, True),
+        ("", 5, False),
+        ("C++ programming", 10, False),
+        ("नमस्ते", 10, False),
+    ], ids=["valid", "empty", "special-characters", "unicode"])
+    def test_search_topics(self, fetcher, query, limit, expect_results):
+        """Test searching valid, empty, special-character and Unicode queries"""
+        results = fetcher.search_topics(query, limit=limit)
         
         assert isinstance(results, list)
+        assert len(results) <= limit
+        if expect_results:
+            assert len(results) > 0
     
-    def test_fetch_article_valid(self):
+    @pytest.mark.integration
+    def test_fetch_article_valid(self, fetcher):
         """Test fetching a valid article"""
-        article = self.fetcher.fetch_article("Python (programming language)")
+        article = fetcher.fetch_article("Python (programming language)")
         
         assert article is not None
         assert "title" in article
@@ -40,33 +67,30 @@ class TestWikipediaFetcher:
         assert "url" in article
         assert len(article["content"]) > 0
     
-    def test_fetch_article_invalid(self):
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_fetch_article_invalid(self, mock_get, isolated_fetcher):
         """Test fetching non-existent article"""
-        article = self.fetcher.fetch_article("ThisArticleDoesNotExist12345XYZ")
+        mock_get.return_value = make_response({"query": {"pages": [
+            {"title": "ThisArticleDoesNotExist12345XYZ", "missing": True}
+        ]}})
+        
+        article = isolated_fetcher.fetch_article("ThisArticleDoesNotExist12345XYZ")
         
         assert article is None
     
-    def test_extract_key_facts(self):
+    def test_extract_key_facts(self, fetcher):
         """Test extracting key facts from content"""
-        content = """
-        This is a test article. [1] It has references. [2]
-        
-        == Section Header ==
-        
-        This is some content.    It has   extra   spaces.
-        This continues for a while with more information.
-        """ * 10  # Make it long
-        
-        key_facts = self.fetcher.extract_key_facts(content, max_length=500)
+        key_facts = fetcher.extract_key_facts(_LONG_ARTICLE_TEXT, max_length=500)
         
         assert len(key_facts) <= 500
         assert "[1]" not in key_facts  # References removed
         assert "==" not in key_facts  # Headers removed
         assert "   " not in key_facts  # Extra spaces removed
     
-    def test_get_article_for_script(self):
+    @pytest.mark.integration
+    def test_get_article_for_script(self, fetcher):
         """Test getting processed article for script generation"""
-        article = self.fetcher.get_article_for_script("ChatGPT")
+        article = fetcher.get_article_for_script("ChatGPT")
         
         if article:  # May fail if Wikipedia is unreachable
             assert "title" in article
@@ -76,10 +100,10 @@ class TestWikipediaFetcher:
             assert len(article["summary"]) <= 500
             assert len(article["key_facts"]) <= 1500
     
-    def test_extract_key_facts_short_content(self):
+    def test_extract_key_facts_short_content(self, fetcher):
         """Test extraction with content shorter than max_length"""
         content = "Short content here."
-        key_facts = self.fetcher.extract_key_facts(content, max_length=1000)
+        key_facts = fetcher.extract_key_facts(content, max_length=1000)
         
         assert key_facts == "Short content here."
 
@@ -87,26 +111,16 @@ class TestWikipediaFetcher:
 class TestWikipediaFetcherEdgeCases:
     """Test edge cases and error handling"""
     
-    def setup_method(self):
-        """Setup test fixtures"""
-        self.fetcher = WikipediaFetcher()
-    
-    def test_search_topics_special_characters(self):
-        """Test search with special characters"""
-        results = self.fetcher.search_topics("C++ programming")
-        
-        assert isinstance(results, list)
-    
-    def test_search_topics_unicode(self):
-        """Test search with Unicode characters"""
-        results = self.fetcher.search_topics("नमस्ते")
-        
-        assert isinstance(results, list)
-    
-    def test_fetch_article_disambiguation(self):
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_fetch_article_disambiguation(self, mock_get, isolated_fetcher):
         """Test handling disambiguation pages"""
-        # "Mercury" is a disambiguation page
-        article = self.fetcher.fetch_article("Mercury")
+        # "Mercury" is a disambiguation page: its extract is a list of meanings
+        mock_get.return_value = make_response({"query": {"pages": [
+            {"pageid": 19694, "title": "Mercury", "extract": "Mercury commonly refers to:\nMercury (planet)\nMercury (element)"}
+        ]}})
+        
+        article = isolated_fetcher.fetch_article("Mercury")
         
-        # Should handle disambiguation and return something
-        assert article is not None or article is None  # Either outcome is acceptable
+        # The page is returned as-is, its lead as the summary
+        assert article["title"] == "Mercury"
+        assert article["summary"] == "Mercury commonly refers to:"
@@ -0,0 +1,426 @@
+"""
+Unit tests for Wikipedia Handler
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch
+from src.wikipedia_handler import WikipediaHandler, _EXTRACT_PARAMS, _LRUCache
+
+
+@pytest.fixture(autouse=True)
+def wiki_cache_dir(tmp_path, monkeypatch):
+    """Keep the on-disk ETag cache inside the test's tmp directory"""
+    cache_dir = tmp_path / "wiki_cache"
+    monkeypatch.setenv("WIKI_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+def make_response(status_code=200, payload=None, headers=None):
+    """Build a mocked Wikipedia HTTP response"""
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.content = json.dumps(payload or {}).encode()
+    return response
+
+
+def extract_payload(*pages):
+    """Build a MediaWiki prop=extracts payload from (title, extract) pairs"""
+    return {"query": {"pages": [
+        {"pageid": i + 1, "title": title, "extract": extract} if extract is not None else {"title": title, "missing": True}
+        for i, (title, extract) in enumerate(pages)
+    ]}}
+
+
+class TestWikipediaHandler:
+    """Test WikipediaHandler with mocked HTTP"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.handler = WikipediaHandler()
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_search_topics(self, mock_get):
+        """Test search results are cleaned and given URLs"""
+        mock_get.return_value = make_response(payload={
+            "query": {"search": [
+                {"title": "Indian Space Research Organisation",
+                 "snippet": 'The <span class="searchmatch">ISRO</span> is India&#039;s &quot;space&quot; agency'}
+            ]}
+        })
+
+        results = self.handler.search_topics("ISRO", limit=5)
+
+        assert len(results) == 1
+        assert results[0]["title"] == "Indian Space Research Organisation"
+        assert results[0]["description"] == 'The ISRO is India\'s "space" agency'
+        assert results[0]["url"] == "https://en.wikipedia.org/wiki/Indian_Space_Research_Organisation"
+
+    def test_session_is_pooled_with_retries(self):
+        """Test HTTPS requests share a retrying connection pool"""
+        adapter = self.handler.session.get_adapter("https://en.wikipedia.org/w/api.php")
+
+        assert adapter.max_retries.total == 3
+        assert self.handler.session.headers["User-Agent"] == self.handler.headers["User-Agent"]
+
+    def test_session_shared_between_handlers(self):
+        """Test every handler reuses the same connection pool"""
+        assert WikipediaHandler().session is self.handler.session
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_search_topics_http_error(self, mock_get):
+        """Test non-200 search responses return an empty list"""
+        mock_get.return_value = make_response(status_code=503)
+
+        assert self.handler.search_topics("ISRO") == []
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_get_article_content_truncates(self, mock_get):
+        """Test article content is limited to max_chars"""
+        mock_get.return_value = make_response(payload=extract_payload(("ISRO", "a" * 100)))
+
+        content = self.handler.get_article_content("ISRO", max_chars=10)
+
+        assert isinstance(content, str)
+        assert content == "a" * 10 + "..."
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_get_article_content_single_full_text_request(self, mock_get):
+        """Test the full plain-text article comes from one query"""
+        mock_get.return_value = make_response(payload=extract_payload(("ISRO", "Lead.\n\nHistory\nFounded in 1969.")))
+
+        content = self.handler.get_article_content("ISRO")
+
+        assert content == "Lead.\n\nHistory\nFounded in 1969."
+        assert mock_get.call_count == 1
+        params = mock_get.call_args.kwargs["params"]
+        assert params["prop"] == "extracts"
+        assert params["explaintext"] and params["redirects"]
+        assert "exintro" not in params
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_get_article_content_missing_page(self, mock_get):
+        """Test a page reported missing returns an empty string"""
+        mock_get.return_value = make_response(payload=extract_payload(("ThisArticleDoesNotExist12345XYZ", None)))
+
+        assert self.handler.get_article_content("ThisArticleDoesNotExist12345XYZ") == ""
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_get_article_content_not_found(self, mock_get):
+        """Test missing articles return an empty string"""
+        mock_get.return_value = make_response(status_code=404)
+
+        assert self.handler.get_article_content("ThisArticleDoesNotExist12345XYZ") == ""
+
+
+class TestWikipediaHandlerArticles:
+    """Test article fetching and preparation for scripts"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.handler = WikipediaHandler()
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_fetch_article(self, mock_get):
+        """Test the article dict uses the resolved title and lead sentences"""
+        text = "ISRO is India's space agency. It was founded in 1969. It is in Bengaluru. It builds rockets.\nHistory\nMore."
+        mock_get.return_value = make_response(payload=extract_payload(("Indian Space Research Organisation", text)))
+
+        article = self.handler.fetch_article("ISRO")
+
+        assert article["title"] == "Indian Space Research Organisation"
+        assert article["summary"] == "ISRO is India's space agency. It was founded in 1969. It is in Bengaluru."
+        assert article["content"] == text
+        assert article["url"] == "https://en.wikipedia.org/wiki/Indian_Space_Research_Organisation"
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_fetch_article_url_is_encoded(self, mock_get):
+        """Test URL-unsafe title characters are percent-encoded, readable ones kept"""
+        mock_get.return_value = make_response(payload=extract_payload(("Who? (TV series) #1", "A show.")))
+
+        article = self.handler.fetch_article("Who? (TV series) #1")
+
+        assert article["url"] == "https://en.wikipedia.org/wiki/Who%3F_(TV_series)_%231"
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_fetch_article_missing(self, mock_get):
+        """Test missing pages return None"""
+        mock_get.return_value = make_response(payload=extract_payload(("Nope", None)))
+
+        assert self.handler.fetch_article("Nope") is None
+        assert self.handler.get_article_for_script("Nope") is None
+
+    def test_extract_key_facts_references(self):
+        """Test references vanish without leaving gaps or doubled spaces"""
+        content = "Founded in 1969[1][2]. It is based in Bengaluru. [3] \n\n== History ==\n\nFirst launch."
+
+        assert self.handler.extract_key_facts(content) == "Founded in 1969. It is based in Bengaluru. First launch."
+
+    def test_extract_key_facts_plain_text(self):
+        """Test markup-free text only has its whitespace collapsed"""
+        assert self.handler.extract_key_facts("  ISRO\n\n was\tfounded  in 1969. ") == "ISRO was founded in 1969."
+        assert self.handler.extract_key_facts("") == ""
+
+    def test_extract_key_facts_sentence_cut(self):
+        """Test long text is cut on a full stop near the limit"""
+        content = "A" * 90 + ". " + "B" * 50
+
+        assert self.handler.extract_key_facts(content, max_length=100) == "A" * 90 + "."
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_get_article_for_script_limits(self, mock_get):
+        """Test summary and key facts respect their length caps"""
+        text = "ISRO launched a rocket. " * 200
+        mock_get.return_value = make_response(payload=extract_payload(("ISRO", text)))
+
+        article = self.handler.get_article_for_script("ISRO")
+
+        assert len(article["summary"]) <= WikipediaHandler.MAX_SUMMARY_CHARS
+        assert len(article["key_facts"]) <= WikipediaHandler.MAX_KEY_FACTS_CHARS
+        assert article["key_facts"].endswith(".")
+
+
+class TestWikipediaHandlerBatch:
+    """Test multi-title article fetches"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.handler = WikipediaHandler()
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_titles_share_one_request(self, mock_get):
+        """Test several titles are fetched in a single query"""
+        payload = extract_payload(("ISRO", "Space agency."), ("Cricket", "Bat and ball game."), ("Nope", None))
+        payload["query"]["redirects"] = [{"from": "Indian Space Research Organisation", "to": "ISRO"}]
+        mock_get.return_value = make_response(payload=payload)
+
+        contents = self.handler.get_articles_content(["Indian Space Research Organisation", "Cricket", "Nope"])
+
+        assert contents == {
+            "Indian Space Research Organisation": "Space agency.",
+            "Cricket": "Bat and ball game.",
+            "Nope": ""
+        }
+        assert mock_get.call_count == 1
+        assert mock_get.call_args.kwargs["params"]["titles"] == "Indian Space Research Organisation|Cricket|Nope"
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_long_lists_are_chunked(self, mock_get):
+        """Test titles beyond the batch size go in further requests"""
+        mock_get.return_value = make_response(payload=extract_payload())
+        titles = [f"Topic {i}" for i in range(WikipediaHandler.BATCH_SIZE + 1)]
+
+        contents = self.handler.get_articles_content(titles)
+
+        assert mock_get.call_count == 2
+        assert list(contents) == titles
+
+
+class TestWikipediaHandlerCache:
+    """Test caching of search and article lookups"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.handler = WikipediaHandler()
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_repeated_search_is_cached(self, mock_get):
+        """Test the same query only hits the network once"""
+        mock_get.return_value = make_response(payload={"query": {"search": [{"title": "ISRO", "snippet": "Agency"}]}})
+
+        first = self.handler.search_topics("ISRO", limit=5)
+        second = self.handler.search_topics(" isro ", limit=5)
+
+        assert first == second
+        assert mock_get.call_count == 1
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_article_cached_across_max_chars(self, mock_get):
+        """Test one fetch serves different truncation lengths"""
+        mock_get.return_value = make_response(payload=extract_payload(("ISRO", "a" * 100)))
+
+        assert self.handler.get_article_content("ISRO", max_chars=10) == "a" * 10 + "..."
+        assert self.handler.get_article_content("ISRO", max_chars=200) == "a" * 100
+        assert mock_get.call_count == 1
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_failures_are_not_cached(self, mock_get):
+        """Test a failed fetch is retried on the next call"""
+        mock_get.side_effect = [make_response(status_code=503), make_response(payload=extract_payload(("ISRO", "ISRO")))]
+
+        assert self.handler.get_article_content("ISRO") == ""
+        assert self.handler.get_article_content("ISRO") == "ISRO"
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_search_and_prefetch_warms_article_cache(self, mock_get):
+        """Test one combined request returns results and caches the top result's article"""
+        payload = extract_payload(("Indian Space Research Organisation", "ISRO is India's space agency."))
+        payload["query"]["search"] = [
+            {"title": "Indian Space Research Organisation", "snippet": "Agency"},
+            {"title": "ISRO (disambiguation)", "snippet": "Other uses"},
+        ]
+        mock_get.return_value = make_response(payload=payload)
+
+        results = self.handler.search_and_prefetch("isro | launch")
+        content = self.handler.get_article_content(results[0]["title"])
+
+        assert content == "ISRO is India's space agency."
+        assert mock_get.call_count == 1
+        params = mock_get.call_args.kwargs["params"]
+        assert params["list"] == "search" and params["generator"] == "search" and params["gsrlimit"] == 1
+        assert "titles" not in params  # The raw query is never looked up as page titles
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_search_and_prefetch_files_page_under_its_own_title(self, mock_get):
+        """Test a generator hit that differs from the top search result never aliases that result"""
+        payload = extract_payload(("Chandrayaan-3", "Chandrayaan-3 landed in 2023."))
+        payload["query"]["search"] = [
+            {"title": "Chandrayaan programme", "snippet": "Missions"},
+            {"title": "Chandrayaan-3", "snippet": "Third mission"},
+        ]
+        programme = extract_payload(("Chandrayaan programme", "The Chandrayaan programme is a series of missions."))
+        mock_get.side_effect = [make_response(payload=payload), make_response(payload=programme)]
+
+        self.handler.search_and_prefetch("chandrayaan")
+
+        assert self.handler.get_article_content("Chandrayaan-3") == "Chandrayaan-3 landed in 2023."
+        assert mock_get.call_count == 1
+        assert self.handler.get_article_content("Chandrayaan programme") == "The Chandrayaan programme is a series of missions."
+        assert mock_get.call_count == 2
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_search_and_prefetch_reuses_cached_search(self, mock_get):
+        """Test a cached search is answered without any request"""
+        mock_get.return_value = make_response(payload={"query": {"search": [{"title": "ISRO", "snippet": "Agency"}]}})
+
+        self.handler.search_topics("ISRO", limit=10)
+        results = self.handler.search_and_prefetch("ISRO")
+        self.handler.search_and_prefetch("ISRO")
+
+        assert results[0]["title"] == "ISRO"
+        assert mock_get.call_count == 1
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_fetch_articles_async_overlaps_requests(self, mock_get):
+        """Test concurrent fetches are in flight together and keyed by requested title"""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get(url, params, **kwargs):
+            barrier.wait()  # Deadlocks (and times out) if the fetches run one at a time
+            title = params["titles"]
+            return make_response(payload=extract_payload((title, f"{title} text.")))
+
+        mock_get.side_effect = get
+
+        articles = asyncio.run(self.handler.fetch_articles_async(["ISRO", "NASA", "ISRO"]))
+
+        assert list(articles) == ["ISRO", "NASA"]
+        assert articles["NASA"]["content"] == "NASA text."
+        assert mock_get.call_count == 2
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_redirect_aliases_share_one_entry(self, mock_get):
+        """Test every title seen for a page resolves to its pageid cache entry"""
+        payload = extract_payload(("Indian Space Research Organisation", "ISRO is India's space agency."))
+        payload["query"]["normalized"] = [{"from": "isro", "to": "Isro"}]
+        payload["query"]["redirects"] = [{"from": "Isro", "to": "Indian Space Research Organisation"}]
+        mock_get.return_value = make_response(payload=payload)
+
+        first = self.handler.get_article_content("isro")
+        for alias in ["Isro", "Indian Space Research Organisation", "Indian_Space_Research_Organisation"]:
+            assert self.handler.get_article_content(alias) == first
+
+        assert mock_get.call_count == 1
+        assert len(self.handler._article_cache._data) == 1
+
+    @patch.object(WikipediaHandler, 'ARTICLE_MAX_AGE', 0)
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_stale_article_revalidated_with_etag(self, mock_get):
+        """Test an expired entry is revalidated and a 304 reuses the cached body"""
+        mock_get.side_effect = [
+            make_response(payload=extract_payload(("ISRO", "ISRO text")), headers={"ETag": '"rev-1"'}),
+            make_response(status_code=304),
+        ]
+
+        first = self.handler.get_article_content("ISRO")
+        second = self.handler.get_article_content("ISRO")
+
+        assert first == second == "ISRO text"
+        assert mock_get.call_count == 2
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"rev-1"'}
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_etag_survives_restart(self, mock_get, wiki_cache_dir):
+        """Test a new handler revalidates from the on-disk ETag cache and reuses the body on 304"""
+        mock_get.side_effect = [
+            make_response(payload=extract_payload(("ISRO", "ISRO text")), headers={"ETag": '"rev-1"'}),
+            make_response(status_code=304),
+        ]
+
+        first = self.handler.get_article_content("ISRO")
+        second = WikipediaHandler().get_article_content("ISRO")
+
+        assert first == second == "ISRO text"
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"rev-1"'}
+        assert len(list(wiki_cache_dir.glob("*.json"))) == 1
+
+    @patch.object(WikipediaHandler, 'ETAG_CACHE_FILES', 2)
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_etag_files_are_capped(self, mock_get, wiki_cache_dir):
+        """Test the oldest on-disk ETag entries are evicted past the file cap"""
+        mock_get.side_effect = lambda url, params, **kwargs: make_response(
+            payload=extract_payload((params["titles"], "text")), headers={"ETag": '"rev-1"'}
+        )
+
+        for title in ["ISRO", "NASA", "ESA"]:
+            self.handler.get_article_content(title)
+
+        assert len(list(wiki_cache_dir.glob("*.json"))) == 2
+        assert not self.handler._etag_path(dict(_EXTRACT_PARAMS, titles="ISRO")).exists()
+
+    @patch('src.wikipedia_handler.requests.Session.get')
+    def test_expired_etag_files_are_dropped(self, mock_get, wiki_cache_dir):
+        """Test entries older than ETAG_CACHE_MAX_AGE are deleted and not revalidated"""
+        mock_get.return_value = make_response(payload=extract_payload(("ISRO", "ISRO text")), headers={"ETag": '"rev-1"'})
+        self.handler.get_article_content("ISRO")
+        (entry,) = wiki_cache_dir.glob("*.json")
+        stale = time.time() - WikipediaHandler.ETAG_CACHE_MAX_AGE - 60
+        os.utime(entry, (stale, stale))
+
+        WikipediaHandler().get_article_content("ISRO")
+
+        assert mock_get.call_args.kwargs["headers"] is None
+        assert entry.exists()  # Rewritten by the fresh 200 response
+        assert entry.stat().st_mtime > stale
+
+    def test_lru_evicts_oldest(self):
+        """Test the cache drops the least recently used entry"""
+        cache = _LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+
+@pytest.mark.integration
+class TestWikipediaHandlerLive:
+    """Live Wikipedia API checks (require network access)"""
+
+    def test_search_and_fetch(self):
+        """Test searching and fetching a real article"""
+        handler = WikipediaHandler()
+
+        results = handler.search_topics("ISRO", limit=5)
+        assert 0 < len(results) <= 5
+
+        content = handler.get_article_content(results[0]["title"])
+        assert isinstance(content, str)
+        assert len(content) > 0